@@ -0,0 +1,160 @@
+"""
+Batch answering module for Career Guidance Chatbot
+Answers a JSONL file of questions through generate_response with a bounded worker pool
+
+Input lines look like:
+    {"id": "q1", "question": "...", "history": [{"role": "user", "content": "..."}],
+     "system_prompt": "..."}
+Only "question" is required. Results are appended to the output JSONL as they
+finish, so an interrupted run resumes by skipping ids already answered.
+
+Run with: python batch_answer.py questions.jsonl answers.jsonl --workers 8 --rpm 60
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import BATCH_WORKERS, BATCH_REQUESTS_PER_MINUTE
+from chatbot import initialize_gemini_client, stream_response
+from concurrency import RateLimiter
+
+
+def load_questions(path):
+    """Read question records, assigning the line number as id when missing."""
+    questions = []
+    with open(path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            item.setdefault("id", str(line_number))
+            item["id"] = str(item["id"])
+            questions.append(item)
+    return questions
+
+
+def load_completed_ids(path):
+    """Return ids that already have a successful answer in the output file."""
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write can leave a truncated last line.
+                continue
+            if item.get("ok"):
+                completed.add(str(item["id"]))
+    return completed
+
+
+def answer_question(item, client, rate_limiter, use_cache=True):
+    """Answer one question record and return the result record with timing."""
+    rate_limiter.wait()
+    start = time.perf_counter()
+    ttft_ms = None
+    chunks = []
+    result = {"id": item["id"], "question": item["question"]}
+    try:
+        for chunk in stream_response(
+            item["question"],
+            client,
+            history=item.get("history"),
+            system_prompt=item.get("system_prompt"),
+            use_cache=use_cache,
+            feature="batch",
+        ):
+            if ttft_ms is None:
+                ttft_ms = (time.perf_counter() - start) * 1000
+            chunks.append(chunk)
+        result.update(ok=True, answer="".join(chunks).strip(), error=None)
+    except Exception as exc:
+        result.update(ok=False, answer=None, error=f"{type(exc).__name__}: {exc}")
+    result["ttft_ms"] = round(ttft_ms, 1) if ttft_ms is not None else None
+    result["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def run_batch(
+    input_path,
+    output_path,
+    workers=BATCH_WORKERS,
+    per_minute=BATCH_REQUESTS_PER_MINUTE,
+    use_cache=True,
+):
+    """
+    Answer every pending question in input_path and append results to output_path.
+
+    Returns:
+        dict: Counts of answered, failed and skipped questions plus wall time
+    """
+    questions = load_questions(input_path)
+    completed = load_completed_ids(output_path)
+    pending = [item for item in questions if item["id"] not in completed]
+
+    client = initialize_gemini_client()
+    rate_limiter = RateLimiter(per_minute, burst=workers)
+    write_lock = threading.Lock()
+    summary = {"answered": 0, "failed": 0, "skipped": len(questions) - len(pending)}
+    start = time.perf_counter()
+
+    with open(output_path, "a", encoding="utf-8") as output, ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="batch"
+    ) as pool:
+        futures = [
+            pool.submit(answer_question, item, client, rate_limiter, use_cache) for item in pending
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            with write_lock:
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+            summary["answered" if result["ok"] else "failed"] += 1
+            done = summary["answered"] + summary["failed"]
+            print(
+                f"[{done}/{len(pending)}] {result['id']} ok={result['ok']} {result['total_ms']} ms",
+                file=sys.stderr,
+            )
+
+    summary["wall_seconds"] = round(time.perf_counter() - start, 2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer a JSONL file of career questions in bulk.")
+    parser.add_argument("input", help="Input JSONL with one question record per line")
+    parser.add_argument("output", help="Output JSONL; existing successful ids are skipped")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        default=BATCH_REQUESTS_PER_MINUTE,
+        help="Requests per minute (0 for no limit)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the response cache, e.g. for prompt regression runs",
+    )
+    args = parser.parse_args()
+
+    summary = run_batch(
+        args.input,
+        args.output,
+        workers=args.workers,
+        per_minute=args.rpm,
+        use_cache=not args.no_cache,
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
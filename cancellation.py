@@ -0,0 +1,102 @@
+"""
+Cancellation module for Career Guidance Chatbot
+Per-session cancel tokens so reruns, navigation and new prompts abort in-flight generations
+"""
+
+import threading
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+ACTIVE_GENERATION_KEY = "active_generation"
+
+
+class GenerationCancelled(Exception):
+    """Raised to the reader of a stream whose generation was cancelled."""
+
+
+class CancelToken:
+    """
+    Thread-safe, one-shot cancellation flag with wake-up callbacks.
+
+    poll, if given, is called on every raise_if_cancelled() check and may
+    raise to abort the reader for reasons the token cannot be told about
+    from another thread (a pending Streamlit rerun or stop).
+    """
+
+    def __init__(self, poll=None):
+        self.poll = poll
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        """Mark the token cancelled and wake everything waiting on it."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks)
+            self._callbacks.clear()
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback):
+        """Call callback on cancellation (immediately if already cancelled)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise GenerationCancelled("Generation was cancelled")
+        if self.poll is not None:
+            self.poll()
+
+
+def _script_yield_point():
+    """
+    Return Streamlit's execution-control check for the current script run.
+
+    Navigation, new prompts and other widget interactions arrive as rerun
+    requests while the script thread is blocked reading a stream, so the
+    cancel calls in the next run cannot happen yet. Calling this check (the
+    one every st.* call makes) raises the pending RerunException or
+    StopException right away instead of at the next chunk.
+    """
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None
+    return getattr(ctx.session_state, "_yield_callback", None)
+
+
+def begin_generation(session_state):
+    """Cancel the session's previous generation, if any, and register a new token."""
+    cancel_active_generation(session_state)
+    token = CancelToken(poll=_script_yield_point())
+    session_state[ACTIVE_GENERATION_KEY] = token
+    return token
+
+
+def finish_generation(session_state, token):
+    """Forget token if it is still the session's active generation."""
+    if session_state.get(ACTIVE_GENERATION_KEY) is token:
+        session_state[ACTIVE_GENERATION_KEY] = None
+
+
+def cancel_active_generation(session_state):
+    """Abort the session's in-flight generation, if there is one."""
+    token = session_state.get(ACTIVE_GENERATION_KEY)
+    if token is not None:
+        token.cancel()
+        session_state[ACTIVE_GENERATION_KEY] = None
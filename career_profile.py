@@ -0,0 +1,387 @@
+"""
+Career profile module for Career Guidance Chatbot
+Incremental, local analysis of Career Recommender answers and candidate path ranking
+"""
+
+import re
+
+INTEREST_KEYWORDS = {
+    "coding": ["coding", "programming", "code", "software", "competitive programming"],
+    "math": ["math", "maths", "mathematics", "statistics", "probability"],
+    "data": ["data", "analytics", "analysis", "dashboards"],
+    "ai": ["ai", "machine learning", "ml", "deep learning", "artificial intelligence"],
+    "web": ["web", "website", "websites", "frontend", "backend"],
+    "apps": ["app", "apps", "mobile", "android", "ios"],
+    "design": ["design", "designing", "ui", "ux", "drawing", "art", "creative"],
+    "robotics": ["robot", "robots", "robotics", "drone", "drones", "automation"],
+    "electronics": ["electronics", "circuit", "circuits", "embedded", "iot", "hardware"],
+    "business": ["business", "finance", "marketing", "economics", "startup"],
+    "security": ["security", "hacking", "cyber", "cybersecurity"],
+    "infrastructure": ["cloud", "devops", "servers", "networking", "infrastructure"],
+    "research": ["research", "physics", "science", "experiments", "papers"],
+    "core": ["mechanical", "civil", "electrical", "chemical", "thermodynamics", "manufacturing"],
+    "games": ["game", "games", "gaming", "unity"],
+    "people": ["communication", "speaking", "teaching", "leading", "people", "teamwork"],
+    "life_sciences": ["biology", "biotech", "biotechnology", "genetics", "chemistry",
+                      "healthcare", "health", "medicine", "medical", "pharma"],
+}
+
+SKILL_KEYWORDS = {
+    "python": ["python"],
+    "java": ["java"],
+    "c": ["c language", "c programming"],
+    "c++": ["c++", "cpp"],
+    "javascript": ["javascript", "js"],
+    "html/css": ["html", "css"],
+    "react": ["react", "reactjs"],
+    "node.js": ["node", "nodejs", "node.js"],
+    "sql": ["sql", "mysql", "postgres", "postgresql"],
+    "excel": ["excel", "spreadsheets"],
+    "power bi": ["power bi", "powerbi", "tableau"],
+    "statistics": ["statistics", "stats"],
+    "machine learning": ["machine learning", "ml", "deep learning", "tensorflow", "pytorch"],
+    "dsa": ["dsa", "data structures", "algorithms", "leetcode"],
+    "git": ["git", "github"],
+    "linux": ["linux", "bash", "shell"],
+    "cloud": ["aws", "azure", "gcp", "cloud"],
+    "docker": ["docker", "kubernetes", "containers"],
+    "figma": ["figma", "canva", "photoshop"],
+    "communication": ["communication", "presentation", "public speaking", "writing"],
+    "leadership": ["leadership", "leading", "managing", "management"],
+    "arduino": ["arduino", "raspberry pi", "microcontroller", "microcontrollers"],
+    "matlab": ["matlab", "simulink"],
+    "cad": ["autocad", "solidworks", "cad", "catia"],
+    "networking": ["networking", "networks", "tcp/ip"],
+}
+
+WORK_KEYWORDS = {
+    "creative": ["creative", "design", "designing"],
+    "analytical": ["analytical", "analysis", "analyzing", "research"],
+    "technical": ["technical", "building", "engineering", "coding"],
+    "management": ["management", "managing", "manager", "leading", "leadership"],
+}
+
+TEAM_KEYWORDS = {
+    "team": ["team", "teams", "together", "collaborat"],
+    "independent": ["independent", "independently", "alone", "solo", "on my own"],
+}
+
+GOAL_KEYWORDS = {
+    "job": ["job", "placement", "placements", "company", "product role", "industry"],
+    "higher_studies": ["higher studies", "m.tech", "mtech", "ms degree", "ms in", "masters",
+                       "mba", "study abroad", "studies abroad"],
+    "startup": ["startup", "start-up", "entrepreneur", "own company", "business"],
+    "government": ["government", "gate", "psu", "upsc", "ssc", "ies", "govt", "exams"],
+    "research": ["research", "phd", "scientist", "publish"],
+}
+
+# Catalog for the locally ranked shortlist passed to the model as optional hints.
+CAREER_PATHS = [
+    {
+        "name": "Software Development Engineer",
+        "interests": {"coding", "apps", "web", "math"},
+        "skills": ["dsa", "python", "java", "c++", "git", "sql"],
+        "work": {"technical", "analytical"},
+        "goals": {"job", "startup"},
+        "roadmap": "backend",
+    },
+    {
+        "name": "Data Scientist / ML Engineer",
+        "interests": {"ai", "data", "math", "research"},
+        "skills": ["python", "statistics", "machine learning", "sql"],
+        "work": {"analytical", "technical"},
+        "goals": {"job", "higher_studies", "research"},
+        "roadmap": "ai-data-scientist",
+    },
+    {
+        "name": "Data Analyst",
+        "interests": {"data", "math", "business"},
+        "skills": ["sql", "excel", "power bi", "python", "statistics"],
+        "work": {"analytical"},
+        "goals": {"job"},
+        "roadmap": "data-analyst",
+    },
+    {
+        "name": "Full Stack Web Developer",
+        "interests": {"web", "coding", "apps", "design"},
+        "skills": ["html/css", "javascript", "react", "node.js", "sql", "git"],
+        "work": {"technical", "creative"},
+        "goals": {"job", "startup"},
+        "roadmap": "full-stack",
+    },
+    {
+        "name": "Mobile App Developer",
+        "interests": {"apps", "coding", "design"},
+        "skills": ["java", "javascript", "react", "git"],
+        "work": {"technical", "creative"},
+        "goals": {"job", "startup"},
+        "roadmap": "android",
+    },
+    {
+        "name": "UI/UX Designer",
+        "interests": {"design", "apps", "web", "people"},
+        "skills": ["figma", "html/css", "communication"],
+        "work": {"creative"},
+        "goals": {"job", "startup"},
+        "roadmap": "frontend",
+    },
+    {
+        "name": "Product Manager",
+        "interests": {"business", "people", "apps"},
+        "skills": ["communication", "leadership", "sql", "excel"],
+        "work": {"management", "analytical"},
+        "goals": {"job", "startup", "higher_studies"},
+        "roadmap": "product-manager",
+    },
+    {
+        "name": "Cloud / DevOps Engineer",
+        "interests": {"infrastructure", "coding"},
+        "skills": ["linux", "cloud", "docker", "git", "python", "networking"],
+        "work": {"technical"},
+        "goals": {"job"},
+        "roadmap": "devops",
+    },
+    {
+        "name": "Cybersecurity Analyst",
+        "interests": {"security", "infrastructure"},
+        "skills": ["networking", "linux", "python"],
+        "work": {"technical", "analytical"},
+        "goals": {"job", "government"},
+        "roadmap": "cyber-security",
+    },
+    {
+        "name": "Embedded Systems / IoT Engineer",
+        "interests": {"electronics", "robotics"},
+        "skills": ["c", "c++", "arduino", "matlab"],
+        "work": {"technical"},
+        "goals": {"job", "research"},
+        "roadmap": "cpp",
+    },
+    {
+        "name": "Robotics Engineer",
+        "interests": {"robotics", "electronics", "ai", "core"},
+        "skills": ["python", "c++", "arduino", "matlab", "cad"],
+        "work": {"technical", "analytical"},
+        "goals": {"job", "research", "higher_studies"},
+        "roadmap": "python",
+    },
+    {
+        "name": "Core Engineering via GATE / PSUs",
+        "interests": {"core", "math"},
+        "skills": ["cad", "matlab"],
+        "work": {"technical", "analytical"},
+        "goals": {"government", "higher_studies"},
+        "roadmap": None,
+    },
+    {
+        "name": "Researcher / Higher Studies (M.Tech, MS, PhD)",
+        "interests": {"research", "math", "ai"},
+        "skills": ["python", "statistics", "matlab"],
+        "work": {"analytical"},
+        "goals": {"higher_studies", "research"},
+        "roadmap": None,
+    },
+    {
+        "name": "Startup Founder / Tech Entrepreneur",
+        "interests": {"business", "people", "coding"},
+        "skills": ["communication", "leadership", "javascript", "python"],
+        "work": {"management", "creative"},
+        "goals": {"startup"},
+        "roadmap": None,
+    },
+    {
+        "name": "Biomedical / Healthcare Technology Engineer",
+        "interests": {"life_sciences", "electronics", "research"},
+        "skills": ["python", "matlab", "statistics"],
+        "work": {"technical", "analytical"},
+        "goals": {"job", "higher_studies", "research"},
+        "roadmap": None,
+    },
+    {
+        "name": "Bioinformatics / Health Data Analyst",
+        "interests": {"life_sciences", "data", "research"},
+        "skills": ["python", "statistics", "sql"],
+        "work": {"analytical"},
+        "goals": {"job", "higher_studies", "research"},
+        "roadmap": None,
+    },
+    {
+        "name": "Game Developer",
+        "interests": {"games", "coding", "design"},
+        "skills": ["c++", "javascript", "figma"],
+        "work": {"creative", "technical"},
+        "goals": {"job", "startup"},
+        "roadmap": "game-developer",
+    },
+]
+
+CANDIDATE_COUNT = 3
+ANSWER_LABELS = [
+    "Subjects/activities enjoyed",
+    "Current skills",
+    "Preferred work type",
+    "Team vs independent preference",
+    "Long-term goals",
+]
+
+
+def _compile(lexicon):
+    return {
+        label: re.compile(r"(?<![\w+#])(?:" + "|".join(map(re.escape, words)) + r")(?![\w+#])")
+        for label, words in lexicon.items()
+    }
+
+
+_INTERESTS = _compile(INTEREST_KEYWORDS)
+_SKILLS = _compile(SKILL_KEYWORDS)
+_WORK = _compile(WORK_KEYWORDS)
+_GOALS = _compile(GOAL_KEYWORDS)
+_TEAM = {
+    label: re.compile(r"\b(?:" + "|".join(map(re.escape, words)) + r")")
+    for label, words in TEAM_KEYWORDS.items()
+}
+
+
+_CLAUSE_BREAK = re.compile(r"[.,;!?]|\b(?:but|and|or|though|although)\b")
+_NEGATION = re.compile(r"\b(?:not|no|never|without|dont|cant|cannot)\b|n't")
+
+
+def _negated(text, start):
+    """True if a negation precedes position start within the same clause."""
+    clause_start = 0
+    for match in _CLAUSE_BREAK.finditer(text, 0, start):
+        clause_start = match.end()
+    return bool(_NEGATION.search(text, clause_start, start))
+
+
+def _labels(patterns, text):
+    """Return labels with at least one match that is not negated ("I do not know python")."""
+    return [
+        label
+        for label, pattern in patterns.items()
+        if any(not _negated(text, match.start()) for match in pattern.finditer(text))
+    ]
+
+
+def extract_signals(answer):
+    """
+    Pull interests, skills, work style, team preference and goals out of one answer.
+
+    Returns:
+        dict: Label lists keyed by interests/skills/work/team/goals
+    """
+    text = " ".join(answer.lower().split())
+    team = _labels(_TEAM, text)
+    if "both" in text or "either" in text or len(team) == 2:
+        team = ["both"]
+    return {
+        "interests": _labels(_INTERESTS, text),
+        "skills": _labels(_SKILLS, text),
+        "work": _labels(_WORK, text),
+        "team": team,
+        "goals": _labels(_GOALS, text),
+    }
+
+
+def merge_signals(signals):
+    """Combine per-answer signals into one profile, keeping first-seen order."""
+    profile = {"interests": [], "skills": [], "work": [], "team": [], "goals": []}
+    for item in signals:
+        for field, labels in item.items():
+            for label in labels:
+                if label not in profile[field]:
+                    profile[field].append(label)
+    return profile
+
+
+def rank_career_paths(profile, limit=CANDIDATE_COUNT):
+    """
+    Score the local career path catalog against a profile.
+
+    Returns:
+        list[dict]: Best paths first, each with name, score, matched skills,
+        skill gaps and roadmap slug
+    """
+    interests = set(profile["interests"])
+    skills = set(profile["skills"])
+    work = set(profile["work"])
+    goals = set(profile["goals"])
+    ranked = []
+    for order, path in enumerate(CAREER_PATHS):
+        if interests and not path["interests"] & interests:
+            # Skills alone should not push paths outside the student's stated interests.
+            continue
+        matched = [skill for skill in path["skills"] if skill in skills]
+        score = (
+            2.0 * len(path["interests"] & interests)
+            + 1.5 * len(matched)
+            + 1.0 * len(path["work"] & work)
+            + 1.5 * len(path["goals"] & goals)
+        )
+        if "management" in path["work"] and profile["team"] in (["team"], ["both"]):
+            score += 0.5
+        if score > 0:
+            ranked.append(
+                (
+                    -score,
+                    order,
+                    {
+                        "name": path["name"],
+                        "score": score,
+                        "matched_skills": matched,
+                        "skill_gaps": [s for s in path["skills"] if s not in skills][:3],
+                        "roadmap": path["roadmap"],
+                    },
+                )
+            )
+    ranked.sort(key=lambda item: item[:2])
+    return [item[2] for item in ranked[:limit]]
+
+
+def build_synthesis_prompt(answers, candidates):
+    """
+    Build the final prompt: the full labelled answers plus a one-line shortlist hint.
+
+    The shortlist comes from keyword matching and can be wrong, so it is
+    labelled as optional and the answers take precedence.
+    """
+    lines = ["Student responses:"]
+    for index, (label, answer) in enumerate(zip(ANSWER_LABELS, answers), start=1):
+        lines.append(f"{index}. {label}: {answer}")
+    if candidates:
+        lines.append("")
+        lines.append(
+            "Optional hint, paths a keyword match suggests: "
+            + ", ".join(path["name"] for path in candidates)
+        )
+    lines.append("")
+    lines.append("Now provide personalized recommendations exactly as instructed.")
+    return "\n".join(lines)
+
+
+class RecommenderAnalysis:
+    """
+    Keyword analysis of recommender answers, updated as each answer arrives.
+
+    Extraction is local and takes well under a millisecond per answer, so it
+    runs inline; it drives the progress display and the shortlist hint.
+    """
+
+    def __init__(self):
+        self._signals = {}
+
+    def submit(self, index, answer):
+        """Analyse the answer to question index (replacing any earlier one)."""
+        self._signals[index] = extract_signals(answer)
+
+    def discard(self, index):
+        """Drop the analysis for question index, e.g. when its answer is rolled back."""
+        self._signals.pop(index, None)
+
+    def progress(self):
+        """Return how many answers have been analysed."""
+        return len(self._signals)
+
+    def profile(self):
+        """Merge the per-answer analyses into one profile."""
+        return merge_signals([self._signals[index] for index in sorted(self._signals)])
@@ -0,0 +1,209 @@
+"""
+Chat history module for Career Guidance Chatbot
+Bounded per-session message history backed by a compressed archive or the conversation store
+"""
+
+import gzip
+import json
+import os
+import uuid
+import weakref
+from collections import deque
+
+from config import HISTORY_HOT_MESSAGES, HISTORY_SPILL_BATCH, HISTORY_ARCHIVE_DIR
+
+
+class ChatMessage:
+    """
+    One chat message stored as a slotted record instead of a dict.
+
+    Supports message["role"] and message.get("content") so code written
+    against the previous list-of-dicts history keeps working.
+    """
+
+    __slots__ = ("role", "content")
+
+    def __init__(self, role, content):
+        self.role = role
+        self.content = content
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+
+def _remove_archive(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ChatHistory:
+    """
+    Sequence of chat messages whose memory use is bounded.
+
+    The newest hot_size messages are kept in memory. Once the hot window
+    overflows, the oldest spill_batch messages are written as one gzip member
+    appended to a per-session archive file; only the byte offset of each
+    member is kept in memory. len(), indexing and slicing cover the whole
+    conversation, reading archived members back only when they are asked for.
+    The archive is deleted when the history object is garbage collected.
+
+    When a ConversationStore and conversation id are given, every message is
+    written through to the store instead, the store serves as the archive,
+    and an existing conversation is resumed with its newest messages hot.
+    """
+
+    def __init__(
+        self,
+        messages=(),
+        hot_size=HISTORY_HOT_MESSAGES,
+        spill_batch=HISTORY_SPILL_BATCH,
+        archive_dir=HISTORY_ARCHIVE_DIR,
+        store=None,
+        conversation=None,
+    ):
+        if not 0 < spill_batch <= hot_size:
+            raise ValueError("spill_batch must be between 1 and hot_size")
+        if (store is None) != (conversation is None):
+            raise ValueError("store and conversation must be given together")
+        self.hot_size = hot_size
+        self.spill_batch = spill_batch
+        self.store = store
+        self.conversation = conversation
+        self._hot = deque()
+        self._archived = 0
+
+        if store is not None:
+            self.archive_path = None
+            total = store.count(conversation)
+            if total:
+                self._archived = max(0, total - hot_size)
+                self._hot.extend(
+                    ChatMessage(role, content)
+                    for role, content in store.read(conversation, self._archived, total)
+                )
+                return
+        else:
+            self.archive_path = os.path.join(archive_dir, f"{uuid.uuid4().hex}.jsonl.gz")
+            self._archive_dir = archive_dir
+            # (first message index, byte offset, byte length) per archive member
+            self._members = []
+            weakref.finalize(self, _remove_archive, self.archive_path)
+
+        for message in messages:
+            self.append(message)
+
+    @property
+    def archived_count(self):
+        """Number of messages that live only in the on-disk archive."""
+        return self._archived
+
+    def __len__(self):
+        return self._archived + len(self._hot)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        yield from self._read_archive(0, self._archived)
+        yield from self._hot
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            return self._range(start, stop)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("chat history index out of range")
+        return self._range(index, index + 1)[0]
+
+    def append(self, message):
+        """Add a message given as a ChatMessage or a dict with role/content."""
+        if not isinstance(message, ChatMessage):
+            message = ChatMessage(message["role"], message["content"])
+        if self.store is not None:
+            self.store.append(self.conversation, len(self), message.role, message.content)
+        self._hot.append(message)
+        if len(self._hot) > self.hot_size:
+            self._spill()
+
+    def pop(self):
+        """Remove and return the newest message; archived messages cannot be popped."""
+        if not self._hot:
+            raise IndexError("pop from empty chat history window")
+        message = self._hot.pop()
+        if self.store is not None:
+            self.store.truncate(self.conversation, len(self))
+        return message
+
+    def recent(self):
+        """Return the in-memory messages, oldest first."""
+        return list(self._hot)
+
+    def older(self, count):
+        """Return up to count archived messages just before the in-memory window."""
+        count = max(0, min(count, self._archived))
+        return self._read_archive(self._archived - count, self._archived)
+
+    def _range(self, start, stop):
+        if start >= stop:
+            return []
+        messages = []
+        if start < self._archived:
+            messages.extend(self._read_archive(start, min(stop, self._archived)))
+        hot_start = max(start - self._archived, 0)
+        hot_stop = stop - self._archived
+        if hot_stop > hot_start:
+            messages.extend(list(self._hot)[hot_start:hot_stop])
+        return messages
+
+    def _spill(self):
+        batch = [self._hot.popleft() for _ in range(self.spill_batch)]
+        if self.store is not None:
+            # Already written through; dropping them from memory is enough.
+            self._archived += len(batch)
+            return
+        payload = "".join(
+            json.dumps([message.role, message.content], ensure_ascii=False) + "\n"
+            for message in batch
+        )
+        data = gzip.compress(payload.encode("utf-8"))
+        os.makedirs(self._archive_dir, exist_ok=True)
+        with open(self.archive_path, "ab") as archive:
+            archive.seek(0, os.SEEK_END)
+            offset = archive.tell()
+            archive.write(data)
+        self._members.append((self._archived, offset, len(data)))
+        self._archived += len(batch)
+
+    def _read_archive(self, start, stop):
+        if start >= stop:
+            return []
+        if self.store is not None:
+            return [
+                ChatMessage(role, content)
+                for role, content in self.store.read(self.conversation, start, stop)
+            ]
+        messages = []
+        with open(self.archive_path, "rb") as archive:
+            for first, offset, length in self._members:
+                last = first + self.spill_batch
+                if last <= start or first >= stop:
+                    continue
+                archive.seek(offset)
+                lines = gzip.decompress(archive.read(length)).decode("utf-8").splitlines()
+                for position, line in enumerate(lines, start=first):
+                    if start <= position < stop:
+                        messages.append(ChatMessage(*json.loads(line)))
+        return messages
@@ -3,14 +3,23 @@ Chatbot module for Career Guidance Chatbot
 Handles Gemini API interaction and response generation
 """
 
-from google import genai
+import requests
 from google.genai import types
-from config import API_KEY, MODEL_NAME, SYSTEM_PROMPT
+from config import SYSTEM_PROMPT, OFF_TOPIC_REFUSAL
+from client_pool import get_gemini_client, report_client_failure, report_client_success
+from response_cache import response_cache, make_cache_key
+from context_window import Turn, build_context_window, new_context_state
+from concurrency import gemini_limiter, aiterate_in_thread
+from coalesce import request_coalescer
+from resilience import resilient_stream, aresilient_stream
+from topic_guard import is_off_topic
+from telemetry import track_call
+from model_router import route_request
 
 
 def initialize_gemini_client():
-    """Initialize Gemini API client with API key."""
-    return genai.Client(api_key=API_KEY)
+    """Return the process-wide pooled Gemini client for the configured API key."""
+    return get_gemini_client()
 
 
 def _map_role(role):
@@ -20,7 +29,232 @@ def _map_role(role):
     return "user"
 
 
-def generate_response(user_input, client, history=None, system_prompt=None):
+def _sync_turns(state, history):
+    """Convert only the chat messages added since the last call into prebuilt turns."""
+    if len(history) < state["synced"]:
+        # The history was reset or replaced; start over.
+        state.update(new_context_state())
+
+    for msg in history[state["synced"] :]:
+        text = (msg.get("content") or "").strip()
+        if not text:
+            continue
+        role = _map_role(msg.get("role", "user"))
+        state["turns"].append(
+            Turn(role, text, types.Content(role=role, parts=[types.Part.from_text(text=text)]))
+        )
+    state["synced"] = len(history)
+
+
+def _with_summary(instruction, summary):
+    """Append the rolling conversation summary to the system instruction."""
+    if not summary:
+        return instruction
+    return f"{instruction}\n\nSummary of the earlier conversation:\n{summary}"
+
+
+class _PreparedRequest:
+    """Contents, config and cache lookup result for one generation call."""
+
+    __slots__ = ("feature", "route", "contents", "config", "key", "use_cache", "cached")
+
+    def __init__(self, feature, route, contents, config, key, use_cache, cached):
+        self.feature = feature
+        self.route = route
+        self.contents = contents
+        self.config = config
+        self.key = key
+        self.use_cache = use_cache
+        self.cached = cached
+
+    @property
+    def flight_key(self):
+        """Coalescing key: callers bypassing the cache only share calls with each other."""
+        return self.key if self.use_cache else f"{self.key}:uncached"
+
+
+def _prepare_request(user_input, history, system_prompt, use_cache, context_state, feature):
+    """Build the model request and look it up in the response cache."""
+    if context_state is None:
+        context_state = new_context_state()
+    _sync_turns(context_state, history or [])
+
+    # Keep the newest turns that fit the token budget; older ones live in the summary.
+    window, summary = build_context_window(context_state)
+    instruction = _with_summary(system_prompt or SYSTEM_PROMPT, summary)
+    route = route_request(feature, user_input, sum(turn.tokens for turn in window))
+
+    # The same key identifies the request for caching and (with use_cache) for coalescing.
+    key = make_cache_key(
+        route.model, instruction, [(turn.role, turn.text) for turn in window], user_input
+    )
+    use_cache = use_cache and response_cache is not None
+    if system_prompt is None and is_off_topic(user_input):
+        # The default prompt answers off-topic questions with a fixed refusal anyway.
+        cached = OFF_TOPIC_REFUSAL
+    else:
+        cached = response_cache.get(key) if use_cache else None
+
+    contents = [turn.content for turn in window]
+    contents.append(
+        types.Content(
+            role="user",
+            parts=[types.Part.from_text(text=user_input)],
+        )
+    )
+
+    config = types.GenerateContentConfig(
+        system_instruction=instruction,
+        **route.generation,
+    )
+    return _PreparedRequest(feature, route, contents, config, key, use_cache, cached)
+
+
+def _store_response(request, received):
+    """Cache a fully received response."""
+    if request.use_cache:
+        response_cache.put(request.key, "".join(received).strip())
+
+
+def _track(route):
+    """Start telemetry for a call, tagged with its routing decision."""
+    return track_call(route.feature, route.model, **route.as_log_fields())
+
+
+def gemini_stream(client, route, contents, config):
+    """
+    Run one Gemini streaming call while holding a limiter slot.
+
+    Shared by every feature that streams from Gemini, so all calls are
+    tracked, limited and counted towards the client pool's health.
+
+    Args:
+        client (genai.Client): Pooled client from client_pool
+        route (model_router.Route): Routing decision for the call
+        contents (list[types.Content]): Request contents
+        config (types.GenerateContentConfig): Generation config
+
+    Yields:
+        str: Non-empty text chunks
+    """
+    with _track(route) as call, gemini_limiter.slot():
+        call.mark_dispatched()
+        try:
+            for chunk in client.models.generate_content_stream(
+                model=route.model,
+                contents=contents,
+                config=config,
+            ):
+                call.observe(chunk)
+                if chunk.text:
+                    yield chunk.text
+        except requests.exceptions.ConnectionError:
+            report_client_failure(client)
+            raise
+    report_client_success(client)
+
+
+async def agemini_stream(client, route, contents, config):
+    """Async variant of gemini_stream."""
+    with _track(route) as call:
+        async with gemini_limiter.aslot():
+            call.mark_dispatched()
+            try:
+                # google-genai 0.3.0's async client reads the SSE body synchronously
+                # on the event loop, so the sync stream is read in worker threads.
+                async for chunk in aiterate_in_thread(
+                    lambda: client.models.generate_content_stream(
+                        model=route.model,
+                        contents=contents,
+                        config=config,
+                    )
+                ):
+                    call.observe(chunk)
+                    if chunk.text:
+                        yield chunk.text
+            except requests.exceptions.ConnectionError:
+                report_client_failure(client)
+                raise
+    report_client_success(client)
+
+
+def _upstream_stream(client, request):
+    """Stream one request with retries and circuit breaking, then cache the result."""
+    received = []
+    for chunk in resilient_stream(
+        lambda: gemini_stream(client, request.route, request.contents, request.config)
+    ):
+        received.append(chunk)
+        yield chunk
+
+    _store_response(request, received)
+
+
+async def _aupstream_stream(client, request):
+    """Async variant of _upstream_stream."""
+    received = []
+    async for chunk in aresilient_stream(
+        lambda: agemini_stream(client, request.route, request.contents, request.config)
+    ):
+        received.append(chunk)
+        yield chunk
+
+    _store_response(request, received)
+
+
+def stream_response(
+    user_input,
+    client,
+    history=None,
+    system_prompt=None,
+    use_cache=True,
+    context_state=None,
+    feature="chat",
+    cancel_token=None,
+):
+    """
+    Stream a conversational response from Gemini chunk by chunk.
+
+    Args:
+        user_input (str): Current user message
+        client (genai.Client): Initialized Gemini client
+        history (list[dict] | None): Previous chat messages with keys role/content
+        system_prompt (str | None): Optional system instruction override
+        use_cache (bool): Serve and store answers through the shared response cache
+        context_state (dict | None): Session rolling-summary state from
+            context_window.new_context_state()
+        feature (str): Feature name the call is attributed to in telemetry
+        cancel_token (cancellation.CancelToken | None): Aborts the stream with
+            GenerationCancelled when cancelled
+
+    The request is prepared as soon as this is called, so messages appended to
+    history afterwards (such as the current turn) are not part of it.
+
+    Returns:
+        Iterator[str]: Text chunks in the order the model produces them
+    """
+    request = _prepare_request(
+        user_input, history, system_prompt, use_cache, context_state, feature
+    )
+    if request.cached is not None:
+        return iter([request.cached])
+
+    # Identical concurrent requests share one upstream call.
+    return request_coalescer.stream(
+        request.flight_key, lambda: _upstream_stream(client, request), cancel_token=cancel_token
+    )
+
+
+def generate_response(
+    user_input,
+    client,
+    history=None,
+    system_prompt=None,
+    use_cache=True,
+    context_state=None,
+    feature="chat",
+    cancel_token=None,
+):
     """
     Generate a conversational response from Gemini using chat history.
 
@@ -29,46 +263,93 @@ def generate_response(user_input, client, history=None, system_prompt=None):
         client (genai.Client): Initialized Gemini client
         history (list[dict] | None): Previous chat messages with keys role/content
         system_prompt (str | None): Optional system instruction override
+        use_cache (bool): Serve and store answers through the shared response cache
+        context_state (dict | None): Session rolling-summary state from
+            context_window.new_context_state()
+        feature (str): Feature name the call is attributed to in telemetry
+        cancel_token (cancellation.CancelToken | None): Aborts the stream with
+            GenerationCancelled when cancelled
 
     Returns:
         str: Response text from the model
     """
-    contents = []
-
-    if history:
-        # Keep recent turns to preserve context while controlling token usage.
-        for msg in history[-12:]:
-            role = _map_role(msg.get("role", "user"))
-            text = (msg.get("content") or "").strip()
-            if not text:
-                continue
-            contents.append(
-                types.Content(
-                    role=role,
-                    parts=[types.Part.from_text(text=text)],
-                )
-            )
-
-    contents.append(
-        types.Content(
-            role="user",
-            parts=[types.Part.from_text(text=user_input)],
+    response = "".join(
+        stream_response(
+            user_input,
+            client,
+            history=history,
+            system_prompt=system_prompt,
+            use_cache=use_cache,
+            context_state=context_state,
+            feature=feature,
+            cancel_token=cancel_token,
         )
     )
+    return response.strip()
 
-    config = types.GenerateContentConfig(
-        system_instruction=system_prompt or SYSTEM_PROMPT,
-        temperature=0.9,
-        top_p=0.95,
+
+async def _aonce(text):
+    yield text
+
+
+def astream_response(
+    user_input,
+    client,
+    history=None,
+    system_prompt=None,
+    use_cache=True,
+    context_state=None,
+    feature="chat",
+    cancel_token=None,
+):
+    """
+    Async variant of stream_response.
+
+    Takes the same arguments as stream_response. Waiting for a slot in the
+    process-wide Gemini limiter and reading the stream (in worker threads)
+    both leave the event loop free.
+
+    Returns:
+        AsyncIterator[str]: Text chunks in the order the model produces them
+    """
+    request = _prepare_request(
+        user_input, history, system_prompt, use_cache, context_state, feature
     )
+    if request.cached is not None:
+        return _aonce(request.cached)
 
-    response = ""
-    for chunk in client.models.generate_content_stream(
-        model=MODEL_NAME,
-        contents=contents,
-        config=config,
-    ):
-        if chunk.text:
-            response += chunk.text
+    # Identical concurrent requests share one upstream call.
+    return request_coalescer.astream(
+        request.flight_key, lambda: _aupstream_stream(client, request), cancel_token=cancel_token
+    )
 
-    return response.strip()
+
+async def agenerate_response(
+    user_input,
+    client,
+    history=None,
+    system_prompt=None,
+    use_cache=True,
+    context_state=None,
+    feature="chat",
+    cancel_token=None,
+):
+    """
+    Async variant of generate_response.
+
+    Returns:
+        str: Response text from the model
+    """
+    received = []
+    async for chunk in astream_response(
+        user_input,
+        client,
+        history=history,
+        system_prompt=system_prompt,
+        use_cache=use_cache,
+        context_state=context_state,
+        feature=feature,
+        cancel_token=cancel_token,
+    ):
+        received.append(chunk)
+    return "".join(received).strip()
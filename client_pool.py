@@ -0,0 +1,197 @@
+"""
+Client pool module for Career Guidance Chatbot
+Shares Gemini clients and keep-alive HTTP connections across sessions and reruns
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from google import genai
+from google.genai import errors
+from google.genai._api_client import HttpResponse, RequestJsonEncoder
+from config import (
+    API_KEY,
+    GEMINI_CLIENT_POOL_SIZE,
+    GEMINI_HTTP_POOL_MAXSIZE,
+    GEMINI_CLIENT_MAX_IDLE_SECONDS,
+    GEMINI_CLIENT_MAX_FAILURES,
+    GEMINI_MAX_CONCURRENT_CALLS,
+    USE_GEMINI_MOCK,
+    GEMINI_MOCK_URL,
+)
+from mock_gemini import ensure_mock_server
+
+
+class _PoolEntry:
+    """A pooled Gemini client together with its shared HTTP session."""
+
+    __slots__ = ("client", "session", "last_used", "failures")
+
+    def __init__(self, client, session):
+        self.client = client
+        self.session = session
+        self.last_used = time.monotonic()
+        self.failures = 0
+
+
+_registry = OrderedDict()
+_lock = threading.Lock()
+
+
+def _build_session():
+    """
+    Create a requests session with a bounded keep-alive connection pool.
+
+    The pool does not block: requests passes no pool timeout to urllib3, so a
+    blocking pool with leaked connections would wait forever. Concurrency is
+    bounded (with a timeout) by gemini_limiter instead, and the pool is at
+    least that large, so an overflow connection is only opened and discarded
+    when an abandoned stream still holds one.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=max(GEMINI_HTTP_POOL_MAXSIZE, GEMINI_MAX_CONCURRENT_CALLS),
+        pool_block=False,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _bind_session(client, entry):
+    """
+    Route the client's HTTP traffic through the pooled session.
+
+    The SDK opens a fresh requests.Session for every call, which means a new
+    TCP/TLS handshake per generation. Sending through one long-lived session
+    lets urllib3 reuse keep-alive connections instead.
+    """
+    api_client = client._api_client
+
+    def _request_unauthorized(http_request, stream=False):
+        data = None
+        if http_request.data:
+            if not isinstance(http_request.data, bytes):
+                data = json.dumps(http_request.data, cls=RequestJsonEncoder)
+            else:
+                data = http_request.data
+
+        response = entry.session.request(
+            http_request.method,
+            http_request.url,
+            headers=http_request.headers,
+            data=data,
+            stream=stream,
+        )
+        errors.APIError.raise_for_response(response)
+        return HttpResponse(response.headers, response if stream else [response.text])
+
+    api_client._request_unauthorized = _request_unauthorized
+
+
+def _create_entry(api_key):
+    if USE_GEMINI_MOCK or GEMINI_MOCK_URL:
+        base_url = GEMINI_MOCK_URL or ensure_mock_server()
+        client = genai.Client(api_key=api_key or "mock-key", http_options={"base_url": base_url})
+    else:
+        client = genai.Client(api_key=api_key)
+    entry = _PoolEntry(client, _build_session())
+    _bind_session(client, entry)
+    return entry
+
+
+def _recycle_session(entry):
+    """Drop idle keep-alive connections that the server may already have closed."""
+    entry.session.close()
+    entry.session = _build_session()
+    entry.failures = 0
+
+
+def get_gemini_client(api_key=None):
+    """
+    Return the shared Gemini client for an API key, creating it on first use.
+
+    Args:
+        api_key (str | None): API key, defaults to GEMINI_API_KEY from config
+
+    Returns:
+        genai.Client: Pooled client safe to share across threads
+    """
+    key = api_key or API_KEY
+
+    with _lock:
+        entry = _registry.get(key)
+        now = time.monotonic()
+
+        if entry is None:
+            entry = _create_entry(key)
+            _registry[key] = entry
+            while len(_registry) > GEMINI_CLIENT_POOL_SIZE:
+                _, evicted = _registry.popitem(last=False)
+                evicted.session.close()
+        else:
+            _registry.move_to_end(key)
+            if (
+                now - entry.last_used > GEMINI_CLIENT_MAX_IDLE_SECONDS
+                or entry.failures >= GEMINI_CLIENT_MAX_FAILURES
+            ):
+                _recycle_session(entry)
+
+        entry.last_used = now
+        return entry.client
+
+
+def _find_entry(client):
+    for entry in _registry.values():
+        if entry.client is client:
+            return entry
+    return None
+
+
+def report_client_failure(client):
+    """Record a transport failure; the session is recycled after repeated failures."""
+    with _lock:
+        entry = _find_entry(client)
+        if entry is not None:
+            entry.failures += 1
+
+
+def report_client_success(client):
+    """Reset the failure count of a pooled client after a healthy call."""
+    with _lock:
+        entry = _find_entry(client)
+        if entry is not None:
+            entry.failures = 0
+
+
+def pool_health():
+    """
+    Summarize the state of every pooled client.
+
+    Returns:
+        list[dict]: One entry per API key with idle time and failure count
+    """
+    now = time.monotonic()
+    with _lock:
+        return [
+            {
+                "key_suffix": (key or "")[-4:],
+                "idle_seconds": round(now - entry.last_used, 1),
+                "failures": entry.failures,
+                "healthy": entry.failures < GEMINI_CLIENT_MAX_FAILURES,
+            }
+            for key, entry in _registry.items()
+        ]
+
+
+def close_pool():
+    """Close every pooled HTTP session and forget all clients."""
+    with _lock:
+        for entry in _registry.values():
+            entry.session.close()
+        _registry.clear()
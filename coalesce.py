@@ -0,0 +1,250 @@
+"""
+Coalescing module for Career Guidance Chatbot
+Single-flight sharing of identical in-flight Gemini requests, including streamed output
+"""
+
+import asyncio
+import threading
+
+# How often a waiting reader re-checks its cancel token.
+READER_POLL_SECONDS = 0.1
+
+
+class CoalescedRequestCancelled(RuntimeError):
+    """Raised to waiters when a shared upstream call stopped before completing."""
+
+
+class _Flight:
+    """One upstream call and the chunks it has produced so far."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.readers = 0
+        self.listeners = set()
+        self.stop = None
+
+    def publish(self, chunk=None, done=False, error=None):
+        with self.lock:
+            if self.done:
+                return
+            if chunk is not None:
+                self.chunks.append(chunk)
+            if done:
+                self.done = True
+                self.error = error
+            listeners = list(self.listeners)
+        for wake in listeners:
+            wake()
+
+    def snapshot(self, start):
+        with self.lock:
+            return self.chunks[start:], self.done, self.error
+
+
+class SingleFlight:
+    """
+    Share one upstream call between concurrent identical requests.
+
+    The first caller for a key starts the producer (in a worker thread for
+    sync producers, as a task for async ones); every caller, including the
+    first, replays the chunks produced so far and then follows the live
+    stream. When the last reader leaves early the producer is stopped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.leaders = 0
+        self.collapsed = 0
+
+    def _join(self, key, start):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.leaders += 1
+            else:
+                self.collapsed += 1
+            flight.readers += 1
+        if leader:
+            start(flight)
+        return flight
+
+    def _leave(self, key, flight):
+        with self._lock:
+            flight.readers -= 1
+            abandoned = flight.readers == 0 and not flight.done
+            if abandoned and self._flights.get(key) is flight:
+                del self._flights[key]
+        if abandoned and flight.stop is not None:
+            flight.stop()
+
+    def _complete(self, key, flight, error):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.publish(done=True, error=error)
+
+    def _start_thread(self, key, flight, producer):
+        stop = threading.Event()
+
+        def cancel():
+            # The worker may be blocked waiting for the first chunk; end the
+            # flight now and let the worker close the upstream call once it returns.
+            stop.set()
+            self._complete(key, flight, CoalescedRequestCancelled("Shared request was stopped"))
+
+        flight.stop = cancel
+
+        def run():
+            error = None
+            iterator = None
+            try:
+                if stop.is_set():
+                    return
+                iterator = producer()
+                for chunk in iterator:
+                    if stop.is_set():
+                        break
+                    flight.publish(chunk)
+            except Exception as exc:
+                error = exc
+            finally:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+                if stop.is_set():
+                    error = CoalescedRequestCancelled("Shared request was stopped")
+                self._complete(key, flight, error)
+
+        threading.Thread(target=run, name="single-flight", daemon=True).start()
+
+    def _start_task(self, key, flight, producer):
+        loop = asyncio.get_running_loop()
+
+        async def run():
+            error = None
+            try:
+                async for chunk in producer():
+                    flight.publish(chunk)
+            except asyncio.CancelledError:
+                error = CoalescedRequestCancelled("Shared request was stopped")
+            except Exception as exc:
+                error = exc
+            finally:
+                self._complete(key, flight, error)
+
+        task = loop.create_task(run())
+        flight.stop = lambda: loop.call_soon_threadsafe(task.cancel)
+
+    def stream(self, key, producer, cancel_token=None):
+        """
+        Yield chunks of the shared call for key, starting it if needed.
+
+        Args:
+            key (str): Identity of the request
+            producer (callable): Zero-argument callable returning an iterator of chunks
+            cancel_token (CancelToken | None): Stops this reader when cancelled; the
+                upstream call is stopped once no reader is left
+
+        Yields:
+            str: Chunks in production order
+        """
+        flight = self._join(key, lambda f: self._start_thread(key, f, producer))
+        wake = threading.Event()
+        with flight.lock:
+            flight.listeners.add(wake.set)
+        if cancel_token is not None:
+            cancel_token.add_callback(wake.set)
+        position = 0
+        try:
+            while True:
+                wake.clear()
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                new, done, error = flight.snapshot(position)
+                position += len(new)
+                yield from new
+                if done:
+                    if error is not None:
+                        raise error
+                    return
+                if not new:
+                    # Timed so the token's poll hook runs even with no chunks arriving.
+                    wake.wait(READER_POLL_SECONDS)
+        finally:
+            if cancel_token is not None:
+                cancel_token.remove_callback(wake.set)
+            with flight.lock:
+                flight.listeners.discard(wake.set)
+            self._leave(key, flight)
+
+    async def astream(self, key, producer, cancel_token=None):
+        """
+        Async variant of stream.
+
+        Args:
+            key (str): Identity of the request
+            producer (callable): Zero-argument callable returning an async iterator
+            cancel_token (CancelToken | None): Stops this reader when cancelled
+
+        Yields:
+            str: Chunks in production order
+        """
+        flight = self._join(key, lambda f: self._start_task(key, f, producer))
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The reader's loop has already closed.
+                pass
+
+        with flight.lock:
+            flight.listeners.add(wake)
+        if cancel_token is not None:
+            cancel_token.add_callback(wake)
+        position = 0
+        try:
+            while True:
+                event.clear()
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                new, done, error = flight.snapshot(position)
+                position += len(new)
+                for chunk in new:
+                    yield chunk
+                if done:
+                    if error is not None:
+                        raise error
+                    return
+                if not new:
+                    try:
+                        await asyncio.wait_for(event.wait(), READER_POLL_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            if cancel_token is not None:
+                cancel_token.remove_callback(wake)
+            with flight.lock:
+                flight.listeners.discard(wake)
+            self._leave(key, flight)
+
+    def stats(self):
+        """Return how many upstream calls were started and how many were collapsed."""
+        with self._lock:
+            return {
+                "upstream_calls": self.leaders,
+                "collapsed": self.collapsed,
+                "in_flight": len(self._flights),
+            }
+
+
+request_coalescer = SingleFlight()
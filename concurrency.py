@@ -0,0 +1,202 @@
+"""
+Concurrency module for Career Guidance Chatbot
+Process-wide FIFO limiter on in-flight Gemini calls, shared by threads and event loops,
+a token-bucket rate limiter for bulk workloads, and a thread bridge for blocking iterators
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+from config import GEMINI_MAX_CONCURRENT_CALLS, GEMINI_QUEUE_TIMEOUT_SECONDS
+
+
+class LimiterTimeout(RuntimeError):
+    """Raised when a caller waits too long for a free Gemini call slot."""
+
+
+class _ThreadWaiter:
+    __slots__ = ("event",)
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def grant(self, limiter):
+        self.event.set()
+
+
+class _AsyncWaiter:
+    __slots__ = ("loop", "future")
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.future = loop.create_future()
+
+    def grant(self, limiter):
+        def _resolve():
+            # A waiter cancelled after being granted must hand the slot back.
+            if self.future.cancelled():
+                limiter.release()
+            else:
+                self.future.set_result(None)
+
+        self.loop.call_soon_threadsafe(_resolve)
+
+
+class FairLimiter:
+    """
+    Counting semaphore with strict FIFO hand-off.
+
+    asyncio.Semaphore is bound to one event loop and threading.Semaphore makes
+    no ordering promise, while Streamlit runs one script thread per session and
+    async callers may each bring their own loop. This limiter queues both kinds
+    of waiter in one deque and passes a released slot directly to the oldest.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._active = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    def _enter_or_enqueue(self, waiter):
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                return True
+            self._waiters.append(waiter)
+            return False
+
+    def acquire(self, timeout=GEMINI_QUEUE_TIMEOUT_SECONDS):
+        """Block the calling thread until a slot is free."""
+        waiter = _ThreadWaiter()
+        if self._enter_or_enqueue(waiter):
+            return
+        if waiter.event.wait(timeout):
+            return
+        with self._lock:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                raise LimiterTimeout("Timed out waiting for a free Gemini call slot")
+
+    async def acquire_async(self, timeout=GEMINI_QUEUE_TIMEOUT_SECONDS):
+        """Wait on the running event loop until a slot is free."""
+        waiter = _AsyncWaiter(asyncio.get_running_loop())
+        if self._enter_or_enqueue(waiter):
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError) as exc:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    if isinstance(exc, asyncio.TimeoutError):
+                        raise LimiterTimeout(
+                            "Timed out waiting for a free Gemini call slot"
+                        ) from None
+                    raise
+            # The slot was granted concurrently with the cancellation.
+            if waiter.future.done():
+                self.release()
+            else:
+                waiter.future.cancel()
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            raise LimiterTimeout("Timed out waiting for a free Gemini call slot") from None
+
+    def release(self):
+        """Free a slot, handing it to the oldest waiter if there is one."""
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().grant(self)
+                return
+            self._active -= 1
+
+    @contextmanager
+    def slot(self):
+        """Hold one slot for the duration of a with-block."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def aslot(self):
+        """Hold one slot for the duration of an async with-block."""
+        await self.acquire_async()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self):
+        """Return the number of active and queued callers."""
+        with self._lock:
+            return {"limit": self.limit, "active": self._active, "queued": len(self._waiters)}
+
+
+gemini_limiter = FairLimiter(GEMINI_MAX_CONCURRENT_CALLS)
+
+
+class RateLimiter:
+    """Thread-safe token bucket that spaces calls to a steady requests-per-minute rate."""
+
+    def __init__(self, per_minute, burst=1):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until one request may be sent."""
+        if not self.interval:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) * self.interval
+            time.sleep(delay)
+
+
+_EXHAUSTED = object()
+
+
+async def aiterate_in_thread(make_iterator):
+    """
+    Iterate a blocking iterator from async code without blocking the event loop.
+
+    make_iterator and every next() run in worker threads. If the reader stops
+    early, the iterator is closed once no next() call is still running.
+
+    Args:
+        make_iterator (callable): Zero-argument callable returning an iterable
+
+    Yields:
+        Items of the iterator in order
+    """
+    iterator = await asyncio.to_thread(lambda: iter(make_iterator()))
+    pending = None
+    try:
+        while True:
+            pending = asyncio.ensure_future(asyncio.to_thread(next, iterator, _EXHAUSTED))
+            item = await asyncio.shield(pending)
+            pending = None
+            if item is _EXHAUSTED:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            if pending is None:
+                close()
+            else:
+                pending.add_done_callback(lambda _: close())
@@ -4,18 +4,195 @@ Contains API keys, model settings, and system prompts
 """
 
 import os
+import tempfile
 
 # Gemini API Configuration
 API_KEY = os.getenv("GEMINI_API_KEY")
 MODEL_NAME = "gemini-3-flash-preview"
 
+# Model Routing
+# Each call picks a tier from its feature and a local prompt-complexity estimate.
+# Only greetings, acknowledgements and short follow-ups in an ongoing chat use the
+# fast tier; everything else, and synthesis-heavy features, use MODEL_NAME.
+MODEL_ROUTING_ENABLED = os.getenv("MODEL_ROUTING", "1") == "1"
+FAST_MODEL_NAME = os.getenv("GEMINI_FAST_MODEL", "gemini-2.5-flash-lite")
+MODEL_TIERS = {
+    "fast": {"model": FAST_MODEL_NAME, "max_output_tokens": 1024},
+    # None leaves the output length to the model's own limit.
+    "strong": {"model": MODEL_NAME, "max_output_tokens": None},
+}
+FEATURE_GENERATION_SETTINGS = {
+    "chat": {"temperature": 0.9, "top_p": 0.95},
+    "batch": {"temperature": 0.9, "top_p": 0.95},
+    "recommender": {"temperature": 0.9, "top_p": 0.95},
+    "learning_resources": {"temperature": 0.35},
+}
+STRONG_TIER_FEATURES = {"recommender", "learning_resources"}
+ROUTER_COMPLEXITY_THRESHOLD = 0.15
+ROUTER_FOLLOW_UP_MAX_WORDS = 6
+
+# Local Gemini Mock
+# GEMINI_MOCK=1 routes every module to a deterministic local stand-in server
+# (see mock_gemini.py); set GEMINI_MOCK_URL to use one that is already running.
+USE_GEMINI_MOCK = os.getenv("GEMINI_MOCK") == "1"
+GEMINI_MOCK_URL = os.getenv("GEMINI_MOCK_URL")
+GEMINI_MOCK_HOST = "127.0.0.1"
+GEMINI_MOCK_PORT = int(os.getenv("GEMINI_MOCK_PORT", "8765"))
+GEMINI_MOCK_TTFT_SECONDS = float(os.getenv("GEMINI_MOCK_TTFT_SECONDS", "0.4"))
+GEMINI_MOCK_CHUNK_CHARS = int(os.getenv("GEMINI_MOCK_CHUNK_CHARS", "24"))
+GEMINI_MOCK_CHUNK_DELAY_SECONDS = float(os.getenv("GEMINI_MOCK_CHUNK_DELAY_SECONDS", "0.03"))
+GEMINI_MOCK_RESPONSE_WORDS = int(os.getenv("GEMINI_MOCK_RESPONSE_WORDS", "120"))
+GEMINI_MOCK_429_RATE = float(os.getenv("GEMINI_MOCK_429_RATE", "0"))
+GEMINI_MOCK_5XX_RATE = float(os.getenv("GEMINI_MOCK_5XX_RATE", "0"))
+GEMINI_MOCK_STALL_RATE = float(os.getenv("GEMINI_MOCK_STALL_RATE", "0"))
+GEMINI_MOCK_STALL_SECONDS = float(os.getenv("GEMINI_MOCK_STALL_SECONDS", "10"))
+GEMINI_MOCK_SEED = int(os.getenv("GEMINI_MOCK_SEED", "7"))
+
+# Gemini Client Pool
+# One shared client per API key, each with a keep-alive HTTP connection pool that keeps
+# up to GEMINI_HTTP_POOL_MAXSIZE idle connections (never fewer than GEMINI_MAX_CONCURRENT_CALLS)
+GEMINI_CLIENT_POOL_SIZE = 4
+GEMINI_HTTP_POOL_MAXSIZE = 32
+GEMINI_CLIENT_MAX_IDLE_SECONDS = 300
+GEMINI_CLIENT_MAX_FAILURES = 3
+
+# Gemini Concurrency
+# Process-wide cap on in-flight Gemini calls; extra callers wait in FIFO order
+GEMINI_MAX_CONCURRENT_CALLS = 16
+GEMINI_QUEUE_TIMEOUT_SECONDS = 60
+
+# Gemini Resilience
+# Quota (429) and server (5xx) errors are retried with jittered exponential backoff.
+# Repeated failures open a circuit breaker that fails fast until the cooldown ends.
+# Set GEMINI_HEDGE_AFTER_SECONDS to start a backup request when the first chunk is slow.
+GEMINI_RETRY_ATTEMPTS = 3
+GEMINI_RETRY_BASE_DELAY_SECONDS = 1.0
+GEMINI_RETRY_MAX_DELAY_SECONDS = 20.0
+GEMINI_BREAKER_FAILURE_THRESHOLD = 5
+GEMINI_BREAKER_COOLDOWN_SECONDS = 30.0
+GEMINI_HEDGE_AFTER_SECONDS = (
+    float(os.getenv("GEMINI_HEDGE_AFTER_SECONDS"))
+    if os.getenv("GEMINI_HEDGE_AFTER_SECONDS")
+    else None
+)
+
+# Topic Guard
+# Local classifier that answers clearly off-topic questions with OFF_TOPIC_REFUSAL
+# without calling Gemini; anything below the threshold is forwarded to the model.
+TOPIC_GUARD_ENABLED = os.getenv("TOPIC_GUARD_ENABLED", "1") == "1"
+TOPIC_GUARD_THRESHOLD = 0.97
+TOPIC_GUARD_MIN_KNOWN_FEATURES = 2
+
+# Batch Answering
+# Defaults for batch_answer.py; the rate limit keeps bulk runs inside the API quota
+BATCH_WORKERS = GEMINI_MAX_CONCURRENT_CALLS
+BATCH_REQUESTS_PER_MINUTE = 60
+
+# LLM Telemetry
+# Every Gemini call is recorded to an in-memory ring buffer; set TELEMETRY_JSONL_PATH
+# to also append records to a file and METRICS_PORT to serve Prometheus text metrics.
+# The metrics endpoint is unauthenticated, so it binds to loopback unless METRICS_HOST
+# says otherwise (e.g. 0.0.0.0 behind a firewall that only admits the scraper).
+TELEMETRY_RING_SIZE = 2000
+TELEMETRY_JSONL_PATH = os.getenv("TELEMETRY_JSONL_PATH")
+METRICS_PORT = int(os.getenv("METRICS_PORT")) if os.getenv("METRICS_PORT") else None
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+# Each Streamlit rerun's server CPU time and emitted element bytes are recorded too.
+RERUN_METRICS_ENABLED = os.getenv("RERUN_METRICS", "1") == "1"
+
+# Fragment Reruns
+# The chat area, recommender and news list rerun on their own as st.fragment regions,
+# so interacting with them does not rebuild the sidebar, navbar and styles.
+# Set STREAMLIT_FRAGMENTS=0 to fall back to whole-app reruns (e.g. for benchmarking).
+FRAGMENTS_ENABLED = os.getenv("STREAMLIT_FRAGMENTS", "1") == "1"
+
+# Rendered Markdown Cache
+# Chat messages are prepared for st.markdown once and reused on later reruns.
+RENDER_CACHE_MAX_ENTRIES = 2048
+
+# Chat Context Window
+# Recent turns are kept while they fit the token budget; older turns are folded
+# into a rolling summary that is capped by its own budget.
+CONTEXT_TOKEN_BUDGET = 2000
+CONTEXT_SUMMARY_TOKEN_BUDGET = 400
+
+# Chat History
+# Each session keeps only its newest messages in memory; older ones spill in
+# batches to a compressed, append-only archive on disk and are read back on demand.
+HISTORY_HOT_MESSAGES = 40
+HISTORY_SPILL_BATCH = 20
+HISTORY_ARCHIVE_DIR = os.getenv("HISTORY_ARCHIVE_DIR") or os.path.join(
+    tempfile.gettempdir(), "careerguide-history"
+)
+
+# Conversation Store
+# Chat messages are written through to SQLite under a random 128-bit token kept in
+# the page URL (?chat=...), so a reload reopens the same conversation and only the
+# newest messages stay in memory; the chat area only draws the newest
+# CHAT_PAGE_SIZE messages until more are requested. Conversations untouched for
+# CONVERSATION_RETENTION_DAYS are deleted.
+CONVERSATION_STORE_ENABLED = os.getenv("CONVERSATION_STORE_ENABLED", "1") == "1"
+CONVERSATION_DB_PATH = os.getenv("CONVERSATION_DB") or os.path.join(
+    tempfile.gettempdir(), "careerguide-conversations.db"
+)
+CONVERSATION_RETENTION_DAYS = float(os.getenv("CONVERSATION_RETENTION_DAYS", "30"))
+CONVERSATION_PRUNE_INTERVAL_SECONDS = 60 * 60
+CHAT_PAGE_SIZE = 20
+
+# Response Cache
+# Identical (system prompt, recent history, question) triples reuse a stored answer.
+# Set RESPONSE_CACHE_DB to a file path to keep cached answers across restarts.
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "1") == "1"
+RESPONSE_CACHE_MAX_ENTRIES = 512
+RESPONSE_CACHE_TTL_SECONDS = 6 * 60 * 60
+RESPONSE_CACHE_DB_PATH = os.getenv("RESPONSE_CACHE_DB")
+RESPONSE_CACHE_DB_MAX_ENTRIES = 20000
+
 # News API Configuration
 # Get free API key from: https://newsapi.org
 # Set it as environment variable: NEWS_API_KEY
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
+NEWS_API_URL = os.getenv("NEWS_API_URL", "https://newsapi.org/v2/everything")
+
+# News Fetching
+# Due keyword queries run concurrently over one keep-alive session. Each request
+# has its own (connect, read) timeout and each round an overall deadline; queries
+# that miss it are retried later.
+NEWS_CONNECT_TIMEOUT_SECONDS = 3
+NEWS_READ_TIMEOUT_SECONDS = 5
+NEWS_FETCH_DEADLINE_SECONDS = 6
+NEWS_FETCH_WORKERS = 9
+
+# News Ingestion
+# A background worker queries every keyword in turn, spreading NEWS_DAILY_REQUEST_BUDGET
+# evenly over the day (shared by all processes using the same store), and keeps new
+# articles in a SQLite store that the news page reads from. The Refresh button
+# queries the most overdue keywords early, at most once per NEWS_REFRESH_MIN_SECONDS.
+# A full page means older matches were cut off; the worker records that gap and, after
+# the round's first pages, pages back through it, up to NEWS_BACKFILL_PAGES requests per
+# gap and round, each wave under its own NEWS_FETCH_DEADLINE_SECONDS.
+NEWS_INGEST_ENABLED = os.getenv("NEWS_INGEST_ENABLED", "1") == "1"
+NEWS_DAILY_REQUEST_BUDGET = int(os.getenv("NEWS_DAILY_REQUEST_BUDGET", "90"))
+NEWS_STORE_DB_PATH = os.getenv("NEWS_STORE_DB") or os.path.join(
+    tempfile.gettempdir(), "careerguide-news.db"
+)
+NEWS_PAGE_SIZE = 20
+NEWS_BACKFILL_PAGES = 2
+NEWS_FEED_SIZE = 10
+NEWS_RETRY_SECONDS = 15 * 60
+NEWS_RATE_LIMIT_BACKOFF_SECONDS = 6 * 60 * 60
+NEWS_INGEST_MAX_SLEEP_SECONDS = 300
+NEWS_REFRESH_MIN_SECONDS = 10 * 60
+NEWS_REFRESH_KEYWORDS = 3
+
+# Fixed reply for questions outside the career guidance scope
+OFF_TOPIC_REFUSAL = (
+    "I am designed to assist only with career-related guidance for engineering students. "
+    "Please ask a career-related question."
+)
 
 # System Prompt for the Career Guidance Bot
-SYSTEM_PROMPT = """
+SYSTEM_PROMPT = f"""
 You are NextStep, a human-like career counselor for engineering students.
 
 Core behavior:
@@ -38,7 +215,7 @@ Career scope:
 
 Strict boundary:
 If the user asks for non-career topics, respond exactly:
-"I am designed to assist only with career-related guidance for engineering students. Please ask a career-related question."
+"{OFF_TOPIC_REFUSAL}"
 """
 
 # Page Configuration
@@ -0,0 +1,108 @@
+"""
+Context window module for Career Guidance Chatbot
+Builds a token-budgeted history window and folds older turns into a rolling summary
+"""
+
+import re
+
+from config import CONTEXT_TOKEN_BUDGET, CONTEXT_SUMMARY_TOKEN_BUDGET
+
+# Per-message framing overhead (role markers, separators) added by the API.
+MESSAGE_TOKEN_OVERHEAD = 4
+SUMMARY_LINE_CHARS = 160
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def estimate_tokens(text):
+    """
+    Estimate the token count of text without calling the API.
+
+    Gemini tokenizers average roughly four characters per token for English,
+    which is accurate enough for budgeting.
+    """
+    if not text:
+        return 0
+    return (len(text) + 3) // 4
+
+
+class Turn:
+    """One history message prepared for the model, built once per session."""
+
+    __slots__ = ("role", "text", "tokens", "content")
+
+    def __init__(self, role, text, content=None):
+        self.role = role
+        self.text = text
+        self.tokens = estimate_tokens(text) + MESSAGE_TOKEN_OVERHEAD
+        self.content = content
+
+
+def new_context_state():
+    """
+    Create the per-session context state.
+
+    turns holds prebuilt Turn objects for the non-empty messages that have not
+    been folded into the summary yet and synced counts the chat messages
+    already converted, so each turn only pays conversion once; summary_lines
+    holds the rolling summary.
+    """
+    return {"turns": [], "synced": 0, "summary_lines": []}
+
+
+def _summarize_turn(role, text):
+    """Condense one turn to its first sentence, truncated to a fixed width."""
+    first = _SENTENCE_END.split(text.strip(), maxsplit=1)[0]
+    if len(first) > SUMMARY_LINE_CHARS:
+        first = first[: SUMMARY_LINE_CHARS - 3].rstrip() + "..."
+    speaker = "Counselor" if role == "model" else "Student"
+    return (role, f"{speaker}: {first}")
+
+
+def _trim_summary(lines, budget):
+    """Drop the oldest counselor lines first, then the oldest student lines."""
+    total = sum(estimate_tokens(line) for _, line in lines)
+    for drop_role in ("model", "user"):
+        idx = 0
+        while total > budget and idx < len(lines):
+            if lines[idx][0] == drop_role:
+                total -= estimate_tokens(lines[idx][1])
+                del lines[idx]
+            else:
+                idx += 1
+    return lines
+
+
+def build_context_window(state, budget=CONTEXT_TOKEN_BUDGET):
+    """
+    Select the newest turns that fit the token budget and summarize the rest.
+
+    Args:
+        state (dict): Context state from new_context_state(); updated in place
+            so each turn is folded into the summary only once
+        budget (int): Token budget for verbatim turns
+
+    Returns:
+        tuple[list[Turn], str]: Verbatim window and summary text
+    """
+    turns = state["turns"]
+
+    start = len(turns)
+    used = 0
+    while start > 0:
+        cost = turns[start - 1].tokens
+        if used + cost > budget:
+            break
+        used += cost
+        start -= 1
+
+    if start > 0:
+        for turn in turns[:start]:
+            state["summary_lines"].append(_summarize_turn(turn.role, turn.text))
+        _trim_summary(state["summary_lines"], CONTEXT_SUMMARY_TOKEN_BUDGET)
+        # Folded turns live on only in the summary; dropping them keeps memory
+        # bounded and means a turn can never re-enter the window.
+        del turns[:start]
+
+    summary = "\n".join(line for _, line in state["summary_lines"])
+    return list(turns), summary
@@ -0,0 +1,134 @@
+"""
+Conversation store module for Career Guidance Chatbot
+Persists chat messages per user/session in SQLite (WAL mode) and reads them back by range
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from config import (
+    CONVERSATION_STORE_ENABLED,
+    CONVERSATION_DB_PATH,
+    CONVERSATION_RETENTION_DAYS,
+    CONVERSATION_PRUNE_INTERVAL_SECONDS,
+)
+
+
+def conversation_id(session_id, channel):
+    """
+    Build the key a conversation is stored under.
+
+    Conversations are keyed only by a random, unguessable session token:
+    login does not verify passwords yet, so an email address must not unlock
+    a stored chat.
+    """
+    return f"session:{session_id}/{channel}"
+
+
+class ConversationStore:
+    """
+    Thread-safe SQLite store of ordered chat messages, one sequence per conversation.
+
+    Conversations whose newest message is older than retention_seconds are
+    deleted on open and then at most once per prune_interval_seconds.
+    """
+
+    def __init__(
+        self,
+        db_path,
+        retention_seconds=CONVERSATION_RETENTION_DAYS * 86400,
+        prune_interval_seconds=CONVERSATION_PRUNE_INTERVAL_SECONDS,
+    ):
+        self._lock = threading.Lock()
+        self.retention_seconds = retention_seconds
+        self.prune_interval_seconds = prune_interval_seconds
+        self._last_prune = 0.0
+        # The default path is in the shared temp directory; keep the file private.
+        os.close(os.open(db_path, os.O_CREAT | os.O_RDWR, 0o600))
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        # WAL lets page reads from other sessions proceed while one session writes.
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS conversation_messages ("
+            "conversation_id TEXT NOT NULL, seq INTEGER NOT NULL, role TEXT NOT NULL, "
+            "content TEXT NOT NULL, created_at REAL NOT NULL, "
+            "PRIMARY KEY (conversation_id, seq)) WITHOUT ROWID"
+        )
+        self._db.commit()
+        self.prune()
+
+    def prune(self):
+        """
+        Delete conversations with no message newer than the retention period.
+
+        Returns:
+            int: Number of messages deleted
+        """
+        now = time.time()
+        with self._lock:
+            self._last_prune = now
+            cursor = self._db.execute(
+                "DELETE FROM conversation_messages WHERE conversation_id IN ("
+                "SELECT conversation_id FROM conversation_messages "
+                "GROUP BY conversation_id HAVING MAX(created_at) < ?)",
+                (now - self.retention_seconds,),
+            )
+            self._db.commit()
+        return cursor.rowcount
+
+    def count(self, conversation):
+        """Return how many messages the conversation holds."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM conversation_messages "
+                "WHERE conversation_id = ?",
+                (conversation,),
+            ).fetchone()
+        return row[0]
+
+    def read(self, conversation, start, stop):
+        """
+        Return the messages with start <= position < stop.
+
+        Returns:
+            list[tuple[str, str]]: (role, content) pairs, oldest first
+        """
+        if start >= stop:
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT role, content FROM conversation_messages "
+                "WHERE conversation_id = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (conversation, start, stop),
+            ).fetchall()
+        return rows
+
+    def append(self, conversation, position, role, content):
+        """Store one message at the given position, replacing any previous one there."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO conversation_messages "
+                "(conversation_id, seq, role, content, created_at) VALUES (?, ?, ?, ?, ?)",
+                (conversation, position, role, content, time.time()),
+            )
+            self._db.commit()
+            prune_due = time.time() - self._last_prune >= self.prune_interval_seconds
+        if prune_due:
+            self.prune()
+
+    def truncate(self, conversation, length):
+        """Delete every message at position length or later."""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM conversation_messages WHERE conversation_id = ? AND seq >= ?",
+                (conversation, length),
+            )
+            self._db.commit()
+
+
+conversation_store = (
+    ConversationStore(CONVERSATION_DB_PATH) if CONVERSATION_STORE_ENABLED else None
+)
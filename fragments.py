@@ -0,0 +1,38 @@
+"""
+Fragments module for Career Guidance Chatbot
+Fragment-scoped reruns for the interactive regions of a page
+"""
+
+import functools
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from config import FRAGMENTS_ENABLED
+from telemetry import track_rerun
+
+
+def fragment(func):
+    """
+    Make func an st.fragment so its widgets rerun only that region of the page.
+
+    Fragment reruns are measured like full reruns. With FRAGMENTS_ENABLED off,
+    func is returned unchanged and every interaction reruns the whole app.
+    """
+    if not FRAGMENTS_ENABLED:
+        return func
+
+    @functools.wraps(func)
+    def measured(*args, **kwargs):
+        with track_rerun():
+            return func(*args, **kwargs)
+
+    return st.fragment(measured)
+
+
+def rerun_fragment():
+    """Rerun the calling fragment, or the whole app outside a fragment rerun."""
+    ctx = get_script_run_ctx()
+    # Streamlit only allows fragment-scoped reruns while a fragment rerun is running.
+    fragment_run = ctx is not None and bool(ctx.fragment_ids_this_run)
+    st.rerun(scope="fragment" if FRAGMENTS_ENABLED and fragment_run else "app")
@@ -3,10 +3,17 @@ Learning Resources module for Career Guidance Chatbot
 Provides internet-backed, structured learning recommendations with roadmap and timetable
 """
 
+import hashlib
+
 import streamlit as st
-from google import genai
 from google.genai import types
-from config import API_KEY, MODEL_NAME
+from config import API_KEY, USE_GEMINI_MOCK
+from client_pool import get_gemini_client
+from cancellation import GenerationCancelled, begin_generation, finish_generation
+from chatbot import gemini_stream
+from coalesce import request_coalescer
+from resilience import resilient_stream, is_quota_error
+from model_router import route_request
 
 
 EXAMPLE_QUERIES = [
@@ -156,8 +163,7 @@ Style:
 """.strip()
 
 
-def _fetch_learning_resources(query, level, weekly_hours, free_first, include_ai_plan):
-    client = genai.Client(api_key=API_KEY)
+def _build_request(query, level, weekly_hours, free_first, include_ai_plan):
     prompt = _build_prompt(query, level, weekly_hours, free_first, include_ai_plan)
 
     contents = [
@@ -173,20 +179,34 @@ def _fetch_learning_resources(query, level, weekly_hours, free_first, include_ai
         )
     ]
 
+    route = route_request("learning_resources", query)
     config = types.GenerateContentConfig(
         tools=tools,
-        temperature=0.35,
+        **route.generation,
     )
+    return route, contents, config
+
+
+def _request_key(*args):
+    return "learning_resources:" + hashlib.sha256(repr(args).encode("utf-8")).hexdigest()
+
 
-    response_text = ""
-    for chunk in client.models.generate_content_stream(
-        model=MODEL_NAME,
-        contents=contents,
-        config=config,
-    ):
-        if chunk.text:
-            response_text += chunk.text
+def _stream_learning_resources(route, contents, config):
+    return resilient_stream(lambda: gemini_stream(get_gemini_client(), route, contents, config))
 
+
+def _fetch_learning_resources(query, level, weekly_hours, free_first, include_ai_plan, cancel_token=None):
+    route, contents, config = _build_request(query, level, weekly_hours, free_first, include_ai_plan)
+    key = _request_key(query, level, weekly_hours, free_first, include_ai_plan)
+
+    # Identical concurrent plan requests share one upstream call.
+    response_text = "".join(
+        request_coalescer.stream(
+            key,
+            lambda: _stream_learning_resources(route, contents, config),
+            cancel_token=cancel_token,
+        )
+    )
     return response_text.strip()
 
 
@@ -301,8 +321,10 @@ def show_learning_resources_page():
             return
 
         with st.spinner("Searching trusted sources and building your plan..."):
+            # Navigating away or a new request aborts the wait for this plan.
+            token = begin_generation(st.session_state)
             try:
-                if not API_KEY:
+                if not API_KEY and not USE_GEMINI_MOCK:
                     raise RuntimeError("GEMINI_API_KEY missing")
                 output = _fetch_learning_resources(
                     query=query.strip(),
@@ -310,11 +332,13 @@ def show_learning_resources_page():
                     weekly_hours=weekly_hours,
                     free_first=free_first,
                     include_ai_plan=include_ai_plan,
+                    cancel_token=token,
                 )
                 st.markdown(output)
+            except GenerationCancelled:
+                return
             except Exception as exc:
-                error_text = str(exc)
-                if "429" in error_text or "RESOURCE_EXHAUSTED" in error_text:
+                if is_quota_error(exc):
                     st.warning(
                         "Gemini quota is exhausted right now, so I generated an offline trusted-plan fallback."
                     )
@@ -330,3 +354,5 @@ def show_learning_resources_page():
                         include_ai_plan=include_ai_plan,
                     )
                 )
+            finally:
+                finish_generation(st.session_state, token)
@@ -0,0 +1,288 @@
+"""
+Mock Gemini module for Career Guidance Chatbot
+Deterministic local stand-in for the Gemini REST API, used for development and load testing
+
+Run standalone with: python mock_gemini.py --port 8765
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import (
+    GEMINI_MOCK_HOST,
+    GEMINI_MOCK_PORT,
+    GEMINI_MOCK_TTFT_SECONDS,
+    GEMINI_MOCK_CHUNK_CHARS,
+    GEMINI_MOCK_CHUNK_DELAY_SECONDS,
+    GEMINI_MOCK_RESPONSE_WORDS,
+    GEMINI_MOCK_429_RATE,
+    GEMINI_MOCK_5XX_RATE,
+    GEMINI_MOCK_STALL_RATE,
+    GEMINI_MOCK_STALL_SECONDS,
+    GEMINI_MOCK_SEED,
+)
+
+_ROUTE = re.compile(r"/models/(?P<model>[^/:]+):(?P<method>streamGenerateContent|generateContent)")
+
+_SENTENCES = [
+    "Start by listing your target roles and the skills each one asks for.",
+    "Solve previous year questions topic by topic before moving to full mocks.",
+    "Build two small projects that show the skills recruiters ask for.",
+    "Keep a weekly review to track weak topics and adjust the plan.",
+    "Use official documentation and NPTEL courses for the fundamentals.",
+    "Apply for internships early and keep your resume to one page.",
+    "Practice data structures daily for thirty to forty five minutes.",
+    "Talk to seniors in the role you want to understand the day-to-day work.",
+    "Reserve the last month for revision and timed practice tests.",
+    "Pick one primary goal for this semester and one fallback option.",
+]
+
+
+class MockSettings:
+    """Latency, chunking and fault-injection knobs for the mock server."""
+
+    def __init__(
+        self,
+        ttft_seconds=GEMINI_MOCK_TTFT_SECONDS,
+        chunk_chars=GEMINI_MOCK_CHUNK_CHARS,
+        chunk_delay_seconds=GEMINI_MOCK_CHUNK_DELAY_SECONDS,
+        response_words=GEMINI_MOCK_RESPONSE_WORDS,
+        rate_limit_rate=GEMINI_MOCK_429_RATE,
+        server_error_rate=GEMINI_MOCK_5XX_RATE,
+        stall_rate=GEMINI_MOCK_STALL_RATE,
+        stall_seconds=GEMINI_MOCK_STALL_SECONDS,
+        seed=GEMINI_MOCK_SEED,
+    ):
+        self.ttft_seconds = ttft_seconds
+        self.chunk_chars = max(1, chunk_chars)
+        self.chunk_delay_seconds = chunk_delay_seconds
+        self.response_words = response_words
+        self.rate_limit_rate = rate_limit_rate
+        self.server_error_rate = server_error_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.seed = seed
+
+
+def _last_user_text(body):
+    for content in reversed(body.get("contents") or []):
+        if content.get("role", "user") == "user":
+            return " ".join(part.get("text", "") for part in content.get("parts", []))
+    return ""
+
+
+def mock_answer(model, prompt, words):
+    """Build the deterministic answer text for a prompt."""
+    digest = hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+    rng = random.Random(digest)
+    lines = [f"**Mock answer** ({model}) to: {prompt.strip()[:60]}", ""]
+    count = 0
+    while count < words:
+        sentence = rng.choice(_SENTENCES)
+        lines.append(f"- {sentence}")
+        count += len(sentence.split())
+    return "\n".join(lines)
+
+
+def _response_dict(text, prompt_tokens=None, output_tokens=None):
+    data = {
+        "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}],
+    }
+    if output_tokens is not None:
+        data["candidates"][0]["finishReason"] = "STOP"
+        data["usageMetadata"] = {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens,
+        }
+    return data
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockGemini/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, code, status, message, retry_after=None):
+        error = {"code": code, "status": status, "message": message}
+        headers = {}
+        if retry_after is not None:
+            error["details"] = [
+                {
+                    "@type": "type.googleapis.com/google.rpc.RetryInfo",
+                    "retryDelay": f"{retry_after}s",
+                }
+            ]
+            headers["Retry-After"] = str(retry_after)
+        self._send_json(code, {"error": error}, headers)
+
+    def _write_chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        route = _ROUTE.search(self.path)
+        if route is None:
+            self._send_error(404, "NOT_FOUND", f"Unknown path {self.path}")
+            return
+
+        settings = self.server.settings
+        fault = self.server.next_fault()
+        if fault == "rate_limit":
+            self._send_error(429, "RESOURCE_EXHAUSTED", "Mock quota exhausted", retry_after=1)
+            return
+        if fault == "server_error":
+            self._send_error(503, "UNAVAILABLE", "Mock backend unavailable")
+            return
+        if fault == "stall":
+            time.sleep(settings.stall_seconds)
+            self._send_error(504, "DEADLINE_EXCEEDED", "Mock request timed out")
+            return
+
+        model = route.group("model")
+        prompt = _last_user_text(body)
+        text = mock_answer(model, prompt, settings.response_words)
+        prompt_tokens = max(1, len(json.dumps(body.get("contents", []))) // 4)
+        output_tokens = max(1, len(text) // 4)
+        time.sleep(settings.ttft_seconds)
+
+        if route.group("method") == "generateContent":
+            self._send_json(200, _response_dict(text, prompt_tokens, output_tokens))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        pieces = [
+            text[i : i + settings.chunk_chars] for i in range(0, len(text), settings.chunk_chars)
+        ]
+        try:
+            for index, piece in enumerate(pieces):
+                last = index == len(pieces) - 1
+                event = _response_dict(
+                    piece,
+                    prompt_tokens if last else None,
+                    output_tokens if last else None,
+                )
+                self._write_chunk(b"data: " + json.dumps(event).encode("utf-8") + b"\r\n\r\n")
+                if not last:
+                    time.sleep(settings.chunk_delay_seconds)
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client cancelled the stream part-way through.
+            self.close_connection = True
+
+
+class MockGeminiServer(ThreadingHTTPServer):
+    """Threaded HTTP server that answers Gemini generateContent requests."""
+
+    daemon_threads = True
+
+    def __init__(self, address, settings=None):
+        super().__init__(address, _Handler)
+        self.settings = settings or MockSettings()
+        self._rng = random.Random(self.settings.seed)
+        self._rng_lock = threading.Lock()
+        self.requests_served = 0
+
+    def next_fault(self):
+        """Draw the injected fault for the next request from the seeded sequence."""
+        with self._rng_lock:
+            self.requests_served += 1
+            roll = self._rng.random()
+        settings = self.settings
+        if roll < settings.rate_limit_rate:
+            return "rate_limit"
+        roll -= settings.rate_limit_rate
+        if roll < settings.server_error_rate:
+            return "server_error"
+        roll -= settings.server_error_rate
+        if roll < settings.stall_rate:
+            return "stall"
+        return None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_mock_server(host=GEMINI_MOCK_HOST, port=GEMINI_MOCK_PORT, settings=None):
+    """Start a mock server on a background thread and return it."""
+    server = MockGeminiServer((host, port), settings)
+    threading.Thread(target=server.serve_forever, name="mock-gemini", daemon=True).start()
+    return server
+
+
+def ensure_mock_server():
+    """Start the shared in-process mock server once and return its base URL."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = start_mock_server()
+        return _server.base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local Gemini stand-in server.")
+    parser.add_argument("--host", default=GEMINI_MOCK_HOST)
+    parser.add_argument("--port", type=int, default=GEMINI_MOCK_PORT)
+    parser.add_argument("--ttft", type=float, default=GEMINI_MOCK_TTFT_SECONDS)
+    parser.add_argument("--chunk-chars", type=int, default=GEMINI_MOCK_CHUNK_CHARS)
+    parser.add_argument("--chunk-delay", type=float, default=GEMINI_MOCK_CHUNK_DELAY_SECONDS)
+    parser.add_argument("--words", type=int, default=GEMINI_MOCK_RESPONSE_WORDS)
+    parser.add_argument("--rate-limit-rate", type=float, default=GEMINI_MOCK_429_RATE)
+    parser.add_argument("--server-error-rate", type=float, default=GEMINI_MOCK_5XX_RATE)
+    parser.add_argument("--stall-rate", type=float, default=GEMINI_MOCK_STALL_RATE)
+    parser.add_argument("--stall-seconds", type=float, default=GEMINI_MOCK_STALL_SECONDS)
+    parser.add_argument("--seed", type=int, default=GEMINI_MOCK_SEED)
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        ttft_seconds=args.ttft,
+        chunk_chars=args.chunk_chars,
+        chunk_delay_seconds=args.chunk_delay,
+        response_words=args.words,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        stall_rate=args.stall_rate,
+        stall_seconds=args.stall_seconds,
+        seed=args.seed,
+    )
+    server = MockGeminiServer((args.host, args.port), settings)
+    print(f"Mock Gemini listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Model router module for Career Guidance Chatbot
+Picks a model tier and generation settings per call from the feature and prompt complexity
+"""
+
+import re
+
+from config import (
+    MODEL_NAME,
+    MODEL_ROUTING_ENABLED,
+    MODEL_TIERS,
+    FEATURE_GENERATION_SETTINGS,
+    STRONG_TIER_FEATURES,
+    ROUTER_COMPLEXITY_THRESHOLD,
+    ROUTER_FOLLOW_UP_MAX_WORDS,
+)
+from context_window import estimate_tokens
+
+_WORD = re.compile(r"[a-z0-9+#.]+")
+_GREETINGS = frozenset(
+    "hi hello hey thanks thank ok okay cool great nice yes no sure bye good morning evening".split()
+)
+# Words that signal the student wants a plan, comparison or detailed synthesis.
+_PLANNING_TERMS = frozenset(
+    """
+    roadmap plan plans planning schedule timetable timeline strategy compare comparison
+    versus vs pros cons semester month months week weeks detailed step steps resume
+    portfolio switch transition choose decide options career path paths prepare preparation
+    """.split()
+)
+
+
+class Route:
+    """Routing decision for one Gemini call."""
+
+    __slots__ = ("feature", "tier", "model", "complexity", "generation")
+
+    def __init__(self, feature, tier, model, complexity, generation):
+        self.feature = feature
+        self.tier = tier
+        self.model = model
+        self.complexity = complexity
+        self.generation = generation
+
+    def as_log_fields(self):
+        return {"route_tier": self.tier, "route_complexity": round(self.complexity, 3)}
+
+
+def estimate_complexity(prompt, context_tokens=0):
+    """
+    Score how demanding a prompt is on a 0-1 scale using only local heuristics.
+
+    Length, planning/comparison vocabulary, multiple questions or list items
+    and a long carried-over context all push the score up; greetings and
+    one-line acknowledgements score zero.
+    """
+    words = _WORD.findall((prompt or "").lower())
+    if not words:
+        return 0.0
+    if len(words) <= 4 and all(word.strip(".") in _GREETINGS for word in words):
+        return 0.0
+
+    score = 0.4 * min(1.0, estimate_tokens(prompt) / 150)
+    planning_hits = sum(1 for word in words if word in _PLANNING_TERMS)
+    score += 0.4 * min(1.0, planning_hits / 2)
+    questions = prompt.count("?") + len(re.findall(r"^\s*(?:[-*]|\d+[.)])\s", prompt, re.M))
+    score += 0.1 * min(2, max(0, questions - 1))
+    if context_tokens > 1000:
+        score += 0.1
+    return min(1.0, score)
+
+
+def is_light_turn(prompt, complexity, context_tokens=0):
+    """
+    True for turns the fast tier can answer as well as the strong one.
+
+    That is a greeting or acknowledgement, or a short follow-up to an ongoing
+    conversation that asks for no plan or comparison. Anything else, including
+    a short but fresh question, goes to the strong tier.
+    """
+    if complexity == 0.0:
+        return True
+    words = _WORD.findall((prompt or "").lower())
+    return (
+        context_tokens > 0
+        and len(words) <= ROUTER_FOLLOW_UP_MAX_WORDS
+        and not any(word in _PLANNING_TERMS for word in words)
+        and complexity < ROUTER_COMPLEXITY_THRESHOLD
+    )
+
+
+def route_request(feature, prompt, context_tokens=0):
+    """
+    Choose the model tier and generation settings for one call.
+
+    Args:
+        feature (str): Calling feature, e.g. "chat", "recommender", "learning_resources"
+        prompt (str): The user input (or built prompt) for the call
+        context_tokens (int): Estimated tokens of history sent alongside the prompt
+
+    Returns:
+        Route: Selected tier, model and generation settings
+    """
+    complexity = estimate_complexity(prompt, context_tokens)
+    if not MODEL_ROUTING_ENABLED:
+        tier = "strong"
+    elif feature not in STRONG_TIER_FEATURES and is_light_turn(prompt, complexity, context_tokens):
+        tier = "fast"
+    else:
+        tier = "strong"
+
+    tier_settings = MODEL_TIERS[tier]
+    generation = dict(FEATURE_GENERATION_SETTINGS.get(feature, {}))
+    if tier_settings["max_output_tokens"] is not None:
+        generation["max_output_tokens"] = tier_settings["max_output_tokens"]
+    model = tier_settings["model"] if MODEL_ROUTING_ENABLED else MODEL_NAME
+    return Route(feature, tier, model, complexity, generation)
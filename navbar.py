@@ -6,6 +6,8 @@ Handles navbar UI and settings
 import streamlit as st
 from datetime import datetime
 
+from cancellation import cancel_active_generation
+
 
 def create_navbar():
     """
@@ -81,6 +83,7 @@ def create_navbar():
 
     with col_home:
         if st.button(" 🏠Home", key="nav_home", use_container_width=True):
+            cancel_active_generation(st.session_state)
             st.session_state.current_page = "home"
             st.rerun()
 
@@ -89,6 +92,7 @@ def create_navbar():
 
     with col_news:
         if st.button(" 📣News", key="nav_news", use_container_width=True):
+            cancel_active_generation(st.session_state)
             st.session_state.current_page = "news"
             st.rerun()
 
@@ -97,6 +101,7 @@ def create_navbar():
 
     with col_profile:
         if st.button(" 👤Profile", key="nav_profile", use_container_width=True):
+            cancel_active_generation(st.session_state)
             st.session_state.current_page = "profile"
             st.rerun()
 
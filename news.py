@@ -5,12 +5,18 @@ Fetches real career-related news from the internet
 
 import streamlit as st
 from datetime import datetime
-import requests
 import os
-from typing import List, Dict
+import time
+from typing import List, Dict, Optional
 import re
 import html
 
+from config import NEWS_FEED_SIZE
+from fragments import fragment
+from news_ingest import ensure_news_ingestor
+from news_search import news_index
+from news_store import article_store
+
 
 def clean_html_tags(text: str) -> str:
     """
@@ -38,63 +44,55 @@ def clean_html_tags(text: str) -> str:
     return text
 
 
-def fetch_news_from_api() -> List[Dict]:
+def load_news_articles(search_term: str = "", refresh: bool = False) -> Optional[List[Dict]]:
     """
-    Fetch real news from NewsAPI related to education, jobs, and careers
+    Read career news from the local article store
+    
+    The store is filled by the background ingestion worker, so page views never
+    wait on NewsAPI and do not spend its quota.
+    
+    Args:
+        search_term: Return the best BM25 matches for this instead of the latest
+        refresh: Ask the worker to query the most overdue keywords now
     
     Returns:
-        List of news articles with details
+        List of news articles with details, or None when no API key is set
     """
-    try:
-        # Get API key from environment variable
-        # Free API key available at: https://newsapi.org
-        api_key = os.getenv("NEWS_API_KEY")
-        
-        if not api_key:
-            st.warning("ℹ️ Note: To display real news, set NEWS_API_KEY environment variable. Get free key at https://newsapi.org")
-            return None
-        
-        # Keywords for education and career news
-        keywords = ["education jobs", "exam results", "career guidance", "engineering recruitment", 
-                   "internship", "GATE exam", "government jobs", "placements", "skill development"]
-        
-        all_articles = []
-        
-        # Fetch news for multiple keywords
-        for keyword in keywords[:3]:  # Limit to 3 keywords to avoid rate limiting
-            url = "https://newsapi.org/v2/everything"
-            params = {
-                "q": keyword,
-                "sortBy": "publishedAt",
-                "language": "en",
-                "pageSize": 5,
-                "apiKey": api_key
-            }
-            
-            response = requests.get(url, params=params, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("articles"):
-                    all_articles.extend(data["articles"])
-        
-        # Remove duplicates
-        seen = set()
-        unique_articles = []
-        for article in all_articles:
-            title = article.get("title", "")
-            if title not in seen:
-                seen.add(title)
-                unique_articles.append(article)
-        
-        return unique_articles[:10]  # Return top 10 articles
-        
-    except requests.exceptions.RequestException as e:
-        st.error(f"❌ Error fetching news: {str(e)}")
-        return None
-    except Exception as e:
-        st.error(f"❌ Unexpected error: {str(e)}")
+    # Get API key from environment variable
+    # Free API key available at: https://newsapi.org
+    if not os.getenv("NEWS_API_KEY"):
+        st.warning("ℹ️ Note: To display real news, set NEWS_API_KEY environment variable. Get free key at https://newsapi.org")
         return None
+    
+    ingestor = ensure_news_ingestor()
+    if refresh and ingestor is not None:
+        ingestor.request_refresh()
+        st.toast("Checking for newer articles...")
+    
+    stats = article_store.stats()
+    if not stats["articles"]:
+        st.info("⏳ Collecting the first articles in the background. Showing sample news for now.")
+        return _filter_articles(get_fallback_news(), search_term)
+    
+    minutes = int((time.time() - stats["last_ingested_at"]) // 60)
+    updated = "just now" if minutes == 0 else f"{minutes} min ago"
+    merged = f" ({stats['duplicates']} duplicate copies merged)" if stats["duplicates"] else ""
+    st.caption(f"🕒 {stats['articles']} stories collected{merged}, newest added {updated}.")
+    
+    if search_term:
+        return news_index.search(search_term, NEWS_FEED_SIZE)
+    return article_store.latest(NEWS_FEED_SIZE)
+
+
+def _filter_articles(articles: List[Dict], search_term: str) -> List[Dict]:
+    """Keep articles whose title or description contains search_term"""
+    if not search_term:
+        return articles
+    return [
+        article for article in articles 
+        if search_term.lower() in article.get("title", "").lower() or 
+           search_term.lower() in article.get("description", "").lower()
+    ]
 
 
 def format_news_article(article: Dict, index: int) -> None:
@@ -144,13 +142,9 @@ def format_news_article(article: Dict, index: int) -> None:
         st.markdown("---")
 
 
-def show_news():
-    """Display career and education-related news from internet"""
-    st.subheader("📰 Education & Career News")
-    
-    # Info box about news source
-    st.info("🌐 Fetching latest news from across the internet related to education, jobs, and careers...")
-    
+@fragment
+def show_news_feed():
+    """Display the news filters and article list; filtering reruns only this fragment"""
     # Filter options
     col1, col2, col3 = st.columns(3)
     
@@ -168,8 +162,8 @@ def show_news():
     
     st.markdown("---")
     
-    # Fetch news
-    articles = fetch_news_from_api()
+    # Read news collected by the background worker
+    articles = load_news_articles(search_term, refresh=refresh)
     
     if articles is None:
         st.warning("""
@@ -189,15 +183,7 @@ def show_news():
         
         Currently showing sample news format while API is unavailable.
         """)
-        articles = get_fallback_news()
-    
-    # Filter articles
-    if search_term:
-        articles = [
-            article for article in articles 
-            if search_term.lower() in article.get("title", "").lower() or 
-               search_term.lower() in article.get("description", "").lower()
-        ]
+        articles = _filter_articles(get_fallback_news(), search_term)
     
     # Sort articles
     if sort_option == "Oldest":
@@ -213,7 +199,17 @@ def show_news():
             format_news_article(article, idx)
     
     st.markdown("---")
+
+
+def show_news():
+    """Display career and education-related news from internet"""
+    st.subheader("📰 Education & Career News")
     
+    # Info box about news source
+    st.info("🌐 Latest news from across the internet related to education, jobs, and careers, collected throughout the day...")
+
+    show_news_feed()
+
     # Newsletter subscription
     st.markdown("### 📧 Subscribe to Career & Education Newsletter")
     col1, col2 = st.columns([3, 1])
@@ -0,0 +1,191 @@
+"""
+News dedupe module for Career Guidance Chatbot
+MinHash signatures and an LSH index that cluster near-duplicate news articles at ingest
+"""
+
+import hashlib
+import random
+import threading
+from array import array
+
+from news_search import tokenize
+from news_store import article_store
+
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+# Estimated Jaccard similarity of shingles above which two articles are one story.
+NEAR_DUPLICATE_THRESHOLD = 0.5
+SHINGLE_WORDS = 2
+
+# Stored with each signature; rows signed under another version are re-signed.
+SIGNATURE_VERSION = 2
+
+_MASK64 = (1 << 64) - 1
+_MERSENNE_PRIME = (1 << 61) - 1
+# Universal hashes (a * x + b) mod p with independent a and b. Fixed seed: signatures
+# are stored, so the hash functions must not change between runs.
+_seed = random.Random(20250101)
+_HASH_PARAMS = [
+    (_seed.randrange(1, _MERSENNE_PRIME), _seed.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+del _seed
+
+
+def shingles(article):
+    """Return the set of word pairs in an article's title and description."""
+    tokens = tokenize(f"{article.get('title') or ''} {article.get('description') or ''}")
+    if len(tokens) <= SHINGLE_WORDS:
+        return {" ".join(tokens)} if tokens else set()
+    return {
+        " ".join(tokens[index : index + SHINGLE_WORDS])
+        for index in range(len(tokens) - SHINGLE_WORDS + 1)
+    }
+
+
+def minhash(article):
+    """
+    Compute the article's MinHash signature.
+
+    Each shingle is hashed once; every permutation is then a universal hash
+    (a * x + b) mod p of that value, so the permutations are independent and
+    signing a large batch stays linear in its total size.
+
+    Returns:
+        tuple[int, ...]: MINHASH_PERMUTATIONS minimums below 2**61 (all 2**64 - 1 if empty)
+    """
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        % _MERSENNE_PRIME
+        for shingle in shingles(article)
+    ]
+    if not hashes:
+        return (_MASK64,) * MINHASH_PERMUTATIONS
+    return tuple(
+        min((a * value + b) % _MERSENNE_PRIME for value in hashes) for a, b in _HASH_PARAMS
+    )
+
+
+def similarity(first, second):
+    """Estimate the Jaccard similarity of two signatures."""
+    return sum(a == b for a, b in zip(first, second)) / MINHASH_PERMUTATIONS
+
+
+def pack_signature(signature):
+    return bytes([SIGNATURE_VERSION]) + array("Q", signature).tobytes()
+
+
+def unpack_signature(blob):
+    return tuple(array("Q", blob[1:]))
+
+
+class NearDuplicateIndex:
+    """
+    LSH index over the signatures of cluster representatives.
+
+    A signature is split into LSH_BANDS bands; articles that share any band
+    bucket are candidates, and a candidate whose estimated similarity reaches
+    NEAR_DUPLICATE_THRESHOLD makes the new article its duplicate. Lookups
+    cost one dict probe per band, so a batch is clustered in linear time
+    instead of comparing every pair.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._signatures = {}
+        self._revision = 0
+        self._stale_cleared = False
+
+    def __len__(self):
+        return len(self._signatures)
+
+    @staticmethod
+    def _bands(signature):
+        for band in range(LSH_BANDS):
+            yield band, signature[band * LSH_ROWS : (band + 1) * LSH_ROWS]
+
+    def match(self, signature):
+        """Return the id of the representative signature is a near duplicate of, or None."""
+        if signature[0] == _MASK64:
+            return None
+        with self._lock:
+            best_id, best_score = None, NEAR_DUPLICATE_THRESHOLD
+            seen = set()
+            for key in self._bands(signature):
+                for candidate in self._buckets.get(key, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    score = similarity(signature, self._signatures[candidate])
+                    if score >= best_score:
+                        best_id, best_score = candidate, score
+            return best_id
+
+    def add(self, article_id, signature):
+        """Register a new cluster representative."""
+        if signature[0] == _MASK64:
+            return
+        with self._lock:
+            if article_id in self._signatures:
+                return
+            self._signatures[article_id] = signature
+            for key in self._bands(signature):
+                self._buckets.setdefault(key, []).append(article_id)
+
+    def remove(self, article_id):
+        """Drop an article that is no longer a cluster representative."""
+        with self._lock:
+            signature = self._signatures.pop(article_id, None)
+            if signature is None:
+                return
+            for key in self._bands(signature):
+                bucket = self._buckets[key]
+                bucket.remove(article_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def classify(self, article):
+        """
+        Sign an article and find the story it repeats.
+
+        Returns:
+            tuple[bytes, int | None]: Packed signature and the representative's
+            id, or None if the article starts a new cluster
+        """
+        signature = minhash(article)
+        return pack_signature(signature), self.match(signature)
+
+    def add_packed(self, article_id, blob):
+        """Register a new cluster representative from its packed signature."""
+        self.add(article_id, unpack_signature(blob))
+
+    def sync(self):
+        """
+        Apply signature changes stored since the last sync and sign legacy rows.
+
+        Picks up clusters created or re-clustered by other processes sharing
+        the store (by store revision, so rows committed out of id order are
+        not missed), and clusters articles stored before signatures existed
+        or signed under an older SIGNATURE_VERSION.
+        """
+        if not self._stale_cleared:
+            self.store.clear_signatures_except(bytes([SIGNATURE_VERSION]))
+            self._stale_cleared = True
+        for revision, article_id, blob, representative in self.store.signatures_after(self._revision):
+            if representative and blob[:1] == bytes([SIGNATURE_VERSION]):
+                self.add_packed(article_id, blob)
+            else:
+                self.remove(article_id)
+            self._revision = revision
+        for article in self.store.unsigned_articles():
+            signature = minhash(article)
+            representative = self.match(signature)
+            self.store.set_signature(article["id"], pack_signature(signature), representative)
+            if representative is None:
+                self.add(article["id"], signature)
+
+
+near_duplicate_index = NearDuplicateIndex(article_store)
@@ -0,0 +1,266 @@
+"""
+News ingestion module for Career Guidance Chatbot
+Background worker that rotates through the news keywords and fills the article store
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    NEWS_API_KEY,
+    NEWS_API_URL,
+    NEWS_CONNECT_TIMEOUT_SECONDS,
+    NEWS_READ_TIMEOUT_SECONDS,
+    NEWS_FETCH_DEADLINE_SECONDS,
+    NEWS_FETCH_WORKERS,
+    NEWS_INGEST_ENABLED,
+    NEWS_DAILY_REQUEST_BUDGET,
+    NEWS_PAGE_SIZE,
+    NEWS_BACKFILL_PAGES,
+    NEWS_RETRY_SECONDS,
+    NEWS_RATE_LIMIT_BACKOFF_SECONDS,
+    NEWS_INGEST_MAX_SLEEP_SECONDS,
+    NEWS_REFRESH_MIN_SECONDS,
+    NEWS_REFRESH_KEYWORDS,
+)
+from news_dedupe import near_duplicate_index
+from news_store import article_store
+
+# Keywords for education and career news
+NEWS_KEYWORDS = ["education jobs", "exam results", "career guidance", "engineering recruitment",
+                 "internship", "GATE exam", "government jobs", "placements", "skill development"]
+
+
+def _build_session():
+    """Create a requests session whose keep-alive pool fits all concurrent queries."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=NEWS_FETCH_WORKERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = _build_session()
+_fetch_pool = ThreadPoolExecutor(max_workers=NEWS_FETCH_WORKERS, thread_name_prefix="news-fetch")
+
+
+def query_news(keyword, api_key, since=None, until=None):
+    """
+    Fetch the newest articles for one keyword over the shared session.
+
+    Args:
+        keyword (str): NewsAPI query
+        api_key (str): NewsAPI key
+        since (str | None): Only return articles published at or after this
+            ISO timestamp (the keyword's newest article so far)
+        until (str | None): Only return articles published at or before this
+            ISO timestamp (used to page back through older matches)
+
+    Raises:
+        requests.exceptions.RequestException: On network errors or a non-200 reply
+    """
+    params = {
+        "q": keyword,
+        "sortBy": "publishedAt",
+        "language": "en",
+        "pageSize": NEWS_PAGE_SIZE,
+        "apiKey": api_key,
+    }
+    if since:
+        params["from"] = since
+    if until:
+        params["to"] = until
+    response = _session.get(
+        NEWS_API_URL,
+        params=params,
+        timeout=(NEWS_CONNECT_TIMEOUT_SECONDS, NEWS_READ_TIMEOUT_SECONDS),
+    )
+    response.raise_for_status()
+    return response.json().get("articles") or []
+
+
+def _oldest(articles):
+    return min((a.get("publishedAt") or "" for a in articles), default="")
+
+
+def keyword_interval_seconds(keyword_count=len(NEWS_KEYWORDS), budget=NEWS_DAILY_REQUEST_BUDGET):
+    """Spacing between queries of one keyword that spreads the daily budget evenly."""
+    return 86400 * keyword_count / max(1, budget)
+
+
+class NewsIngestor:
+    """
+    Keeps the article store current independently of page traffic.
+
+    Each round claims the keywords whose turn has come from the store (which
+    also enforces the shared daily budget), queries them concurrently for
+    articles newer than the last one seen, and upserts the results, folding
+    near-duplicate copies of a story into its first-seen article. A full page
+    means older matches were cut off: the cursor still moves to the newest
+    article, and the range between the old cursor and the page's oldest
+    article is recorded as a gap. After the round's first pages are stored,
+    gaps of the keywords just queried are paged back through with extra
+    requests from the same budget. A failed keyword is retried after
+    NEWS_RETRY_SECONDS; a 429 pauses the worker.
+    """
+
+    def __init__(self, store, keywords, api_key, budget=NEWS_DAILY_REQUEST_BUDGET, near_duplicates=None):
+        self.store = store
+        self.near_duplicates = near_duplicates
+        self.keywords = list(keywords)
+        self.api_key = api_key
+        self.budget = budget
+        self.interval = keyword_interval_seconds(len(self.keywords), budget)
+        self._wake = threading.Event()
+        self._refresh_requested = False
+        self._paused_until = 0.0
+        self._thread = None
+
+    def _backfill(self, keywords):
+        """
+        Page back through the open gaps of keywords, one page per gap per wave.
+
+        Each wave has its own NEWS_FETCH_DEADLINE_SECONDS, outside the round's
+        first-page deadline, and every page that arrives in time is stored even
+        if others miss it. A gap shrinks as its pages come in and closes once a
+        page no longer comes back full.
+
+        Returns:
+            int: Number of articles added to the store
+        """
+        added = 0
+        for _ in range(NEWS_BACKFILL_PAGES):
+            futures = {}
+            for gap in self.store.gaps(keywords):
+                if not self.store.reserve_request(self.budget):
+                    break
+                _, keyword, gap_from, gap_to = gap
+                futures[_fetch_pool.submit(query_news, keyword, self.api_key, gap_from, gap_to)] = gap
+            if not futures:
+                break
+            done, not_done = wait(futures, timeout=NEWS_FETCH_DEADLINE_SECONDS)
+            for future, (gap_id, keyword, _, gap_to) in futures.items():
+                if future not in done:
+                    future.cancel()
+                    continue
+                try:
+                    page = future.result()
+                except requests.exceptions.HTTPError as exc:
+                    if exc.response is not None and exc.response.status_code == 429:
+                        self._paused_until = time.monotonic() + NEWS_RATE_LIMIT_BACKOFF_SECONDS
+                    continue
+                except Exception:
+                    continue
+                added += len(self.store.upsert_articles(keyword, page, self.near_duplicates))
+                oldest = _oldest(page)
+                # "to" is inclusive, so a page that does not reach further back closes the gap.
+                reaches_back = len(page) >= NEWS_PAGE_SIZE and oldest < gap_to
+                self.store.narrow_gap(gap_id, oldest if reaches_back else None)
+            # A late page is still in flight; asking for its gap again would pay twice.
+            if not_done or self._paused_until > time.monotonic():
+                break
+        return added
+
+    def run_once(self, interval=None, limit=None):
+        """
+        Query every due keyword once.
+
+        Returns:
+            int: Number of articles added to the store
+        """
+        claimed = self.store.claim_due_keywords(
+            self.keywords,
+            self.interval if interval is None else interval,
+            self.budget,
+            len(self.keywords) if limit is None else limit,
+        )
+        if not claimed:
+            return 0
+        if self.near_duplicates is not None:
+            self.near_duplicates.sync()
+        futures = {
+            _fetch_pool.submit(query_news, keyword, self.api_key, since): (keyword, since)
+            for keyword, since in claimed
+        }
+        done, not_done = wait(futures, timeout=NEWS_FETCH_DEADLINE_SECONDS)
+        added = 0
+        fetched = []
+        for future, (keyword, since) in futures.items():
+            if future not in done:
+                future.cancel()
+                self.store.record_failure(keyword, NEWS_RETRY_SECONDS, self.interval)
+                continue
+            try:
+                articles = future.result()
+            except requests.exceptions.HTTPError as exc:
+                rate_limited = exc.response is not None and exc.response.status_code == 429
+                retry = NEWS_RATE_LIMIT_BACKOFF_SECONDS if rate_limited else NEWS_RETRY_SECONDS
+                if rate_limited:
+                    self._paused_until = time.monotonic() + retry
+                self.store.record_failure(keyword, retry, self.interval)
+                continue
+            except Exception:
+                self.store.record_failure(keyword, NEWS_RETRY_SECONDS, self.interval)
+                continue
+            new_articles = self.store.upsert_articles(keyword, articles, self.near_duplicates)
+            newest = max((a.get("publishedAt") or "" for a in articles), default=None)
+            self.store.record_success(keyword, newest)
+            if since and len(articles) >= NEWS_PAGE_SIZE:
+                # Matches between the old cursor and this page's oldest article were cut off.
+                self.store.add_gap(keyword, since, _oldest(articles))
+            added += len(new_articles)
+            fetched.append(keyword)
+        if fetched and self._paused_until <= time.monotonic():
+            added += self._backfill(fetched)
+        return added
+
+    def request_refresh(self):
+        """Ask the worker to query the most overdue keywords now (rate limited)."""
+        self._refresh_requested = True
+        self._wake.set()
+
+    def _loop(self):
+        while True:
+            paused = self._paused_until - time.monotonic()
+            if paused > 0:
+                self._wake.wait(min(paused, NEWS_INGEST_MAX_SLEEP_SECONDS))
+                self._wake.clear()
+                continue
+            try:
+                if self._refresh_requested:
+                    self._refresh_requested = False
+                    self.run_once(NEWS_REFRESH_MIN_SECONDS, NEWS_REFRESH_KEYWORDS)
+                self.run_once()
+                delay = self.store.next_due_in(self.keywords, self.interval)
+            except Exception:
+                delay = NEWS_RETRY_SECONDS
+            # Budget-capped rounds claim nothing, so never spin faster than this.
+            self._wake.wait(min(max(delay, 30.0), NEWS_INGEST_MAX_SLEEP_SECONDS))
+            self._wake.clear()
+
+    def start(self):
+        """Start the background thread."""
+        self._thread = threading.Thread(target=self._loop, name="news-ingest", daemon=True)
+        self._thread.start()
+
+
+_ingestor = None
+_ingestor_lock = threading.Lock()
+
+
+def ensure_news_ingestor():
+    """Start the shared ingestion worker once per process, or return None without an API key."""
+    global _ingestor
+    if not NEWS_INGEST_ENABLED or not NEWS_API_KEY:
+        return None
+    with _ingestor_lock:
+        if _ingestor is None:
+            _ingestor = NewsIngestor(
+                article_store, NEWS_KEYWORDS, NEWS_API_KEY, near_duplicates=near_duplicate_index
+            )
+            _ingestor.start()
+        return _ingestor
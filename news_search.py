@@ -0,0 +1,228 @@
+"""
+News search module for Career Guidance Chatbot
+In-memory inverted index with light stemming and BM25 ranking over stored news articles
+"""
+
+import bisect
+import heapq
+import html
+import math
+import re
+import threading
+
+from news_store import article_store
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Title words count this many times towards term frequency.
+TITLE_WEIGHT = 2
+PREFIX_EXPANSION_LIMIT = 20
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or that the "
+    "this to was were will with".split()
+)
+
+_TAG = re.compile(r"<[^>]*>")
+_TOKEN = re.compile(r"[a-z0-9]+(?:\+\+|#)?")
+
+
+# Words whose final "s" is not a plural ("news" is not "new").
+_KEEP_FINAL_S = frozenset(["news", "series", "species", "lens", "bias", "canvas", "gas"])
+_VOWELS = "aeiou"
+
+
+def _restore_e(base):
+    """
+    Put back an "e" removed with -ing/-ed, so "hiring" and "hire" meet.
+
+    Follows Porter's rule: after -at/-bl/-iz, or after a single
+    consonant-vowel-consonant syllable not ending in w, x or y.
+    """
+    if base.endswith(("at", "bl", "iz")):
+        return base + "e"
+    if (
+        len(base) == 3
+        and base[0] not in _VOWELS
+        and base[1] in _VOWELS
+        and base[2] not in _VOWELS + "wxy"
+    ):
+        return base + "e"
+    return base
+
+
+def _strip_suffix(word):
+    """Drop common English inflections (plural, -ing, -ed, -ly)."""
+    if len(word) <= 3 or word[-1].isdigit() or word in _KEEP_FINAL_S:
+        return word
+    if word.endswith("sses"):
+        return word[:-2]
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    for suffix in ("ing", "ed", "ly"):
+        if word.endswith(suffix):
+            base = word[: -len(suffix)]
+            if len(base) >= 3 and re.search("[aeiouy]", base):
+                if len(base) > 3 and base[-1] == base[-2] and base[-1] not in "lsz":
+                    return base[:-1]
+                if suffix == "ly":
+                    return base
+                return _restore_e(base)
+    return word
+
+
+def stem(word):
+    """
+    Reduce a lowercase word to a search stem.
+
+    Deliberately light, so no stemmer dependency is needed: plural and
+    singular forms ("placements", "placement") and -ing/-ed forms ("hiring",
+    "hire") meet, derived words ("recruitment", "recruiting") and a few
+    look-alikes ("news", "new") stay apart.
+    """
+    word = _strip_suffix(word)
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Clean HTML from text and return its stemmed, stopword-free tokens."""
+    text = _TAG.sub(" ", html.unescape(text or "")).lower()
+    return [stem(token) for token in _TOKEN.findall(text) if token not in STOPWORDS]
+
+
+class NewsSearchIndex:
+    """
+    Thread-safe BM25 index over article title, description and source.
+
+    Postings map each stem to {article id: term frequency}. Rows inserted or
+    updated since the last sync are pulled from the store by revision on each
+    search, so the index follows ingestion (from any process) without
+    rebuilding, re-indexing edited articles and dropping ones later folded
+    into another story.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._doc_terms = {}
+        self._published = {}
+        self._total_length = 0
+        self._vocabulary = []
+        self._vocabulary_dirty = False
+        self._revision = 0
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def add(self, article):
+        """Index one stored article (re-indexing it if already present)."""
+        article_id = article["id"]
+        terms = {}
+        for token in tokenize(article.get("title")):
+            terms[token] = terms.get(token, 0) + TITLE_WEIGHT
+        source = (article.get("source") or {}).get("name")
+        for token in tokenize(article.get("description")) + tokenize(source):
+            terms[token] = terms.get(token, 0) + 1
+        with self._lock:
+            self._remove(article_id)
+            for term, frequency in terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    self._vocabulary_dirty = True
+                postings[article_id] = frequency
+            length = sum(terms.values())
+            self._doc_terms[article_id] = (length, tuple(terms))
+            self._published[article_id] = article.get("publishedAt") or ""
+            self._total_length += length
+
+    def _remove(self, article_id):
+        indexed = self._doc_terms.pop(article_id, None)
+        if indexed is None:
+            return
+        length, terms = indexed
+        self._total_length -= length
+        self._published.pop(article_id, None)
+        for term in terms:
+            del self._postings[term][article_id]
+            if not self._postings[term]:
+                del self._postings[term]
+                self._vocabulary_dirty = True
+
+    def remove(self, article_id):
+        """Drop an article from the index."""
+        with self._lock:
+            self._remove(article_id)
+
+    def sync(self):
+        """Apply every store change since the last sync."""
+        for revision, article, representative in self.store.changes_after(self._revision):
+            if representative:
+                self.add(article)
+            else:
+                self.remove(article["id"])
+            self._revision = revision
+
+    def _expand(self, term):
+        """Return indexed stems that start with term, for a partly typed last word."""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect.bisect_left(self._vocabulary, term)
+        matches = []
+        for candidate in self._vocabulary[start:]:
+            if not candidate.startswith(term) or len(matches) >= PREFIX_EXPANSION_LIMIT:
+                break
+            matches.append(candidate)
+        return matches
+
+    def search(self, query, limit):
+        """
+        Rank articles against query with BM25.
+
+        The last query word also matches stems it is a prefix of, so results
+        appear while the word is still being typed.
+
+        Returns:
+            list[dict]: Up to limit stored articles, best match first
+        """
+        self.sync()
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            count = len(self._doc_terms)
+            if not count:
+                return []
+            average_length = self._total_length / count
+            # BM25 length normalisation is k1 * (1 - b + b * length / average_length).
+            norm_base = BM25_K1 * (1 - BM25_B)
+            norm_scale = BM25_K1 * BM25_B / average_length
+            documents = self._doc_terms
+            scores = {}
+            unique_terms = list(dict.fromkeys(terms))
+            for position, term in enumerate(unique_terms):
+                expansions = [term] if term in self._postings else []
+                if not expansions and position == len(unique_terms) - 1:
+                    expansions = self._expand(term)
+                for expanded in expansions:
+                    postings = self._postings[expanded]
+                    df = len(postings)
+                    idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                    for article_id, frequency in postings.items():
+                        norm = norm_base + norm_scale * documents[article_id][0]
+                        scores[article_id] = scores.get(article_id, 0.0) + idf * (
+                            frequency * (BM25_K1 + 1) / (frequency + norm)
+                        )
+            best = heapq.nlargest(
+                limit, scores, key=lambda article_id: (scores[article_id], self._published[article_id])
+            )
+        return self.store.articles_by_id(best)
+
+
+news_index = NewsSearchIndex(article_store)
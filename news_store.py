@@ -0,0 +1,378 @@
+"""
+News store module for Career Guidance Chatbot
+SQLite store of ingested news articles and the per-keyword ingestion schedule
+"""
+
+import sqlite3
+import threading
+import time
+
+from config import NEWS_STORE_DB_PATH
+
+
+def _to_article(row):
+    """Convert a stored row back to the NewsAPI article shape the page renders."""
+    article_id, url, title, description, source, author, image_url, published_at = row
+    return {
+        "id": article_id,
+        "url": url,
+        "title": title,
+        "description": description,
+        "source": {"name": source},
+        "author": author,
+        "urlToImage": image_url,
+        "publishedAt": published_at,
+    }
+
+
+_ARTICLE_COLUMNS = "id, url, title, description, source, author, image_url, published_at"
+# Evaluated inside the write transaction, so revisions follow commit order across processes.
+_NEXT_REVISION = "(SELECT COALESCE(MAX(revision), 0) + 1 FROM news_articles)"
+
+
+class ArticleStore:
+    """
+    Thread-safe SQLite store of news articles keyed by URL.
+
+    Besides the articles it keeps, per keyword, the newest publishedAt seen,
+    the older ranges full pages cut off and when the keyword was last
+    queried, plus a log of upstream requests so every process sharing the
+    file spends one daily quota.
+    """
+
+    def __init__(self, db_path):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS news_articles ("
+            "id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE, title TEXT NOT NULL, "
+            "description TEXT, source TEXT, author TEXT, image_url TEXT, "
+            "published_at TEXT NOT NULL, keyword TEXT NOT NULL, ingested_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS news_articles_published "
+            "ON news_articles (published_at DESC);"
+            "CREATE TABLE IF NOT EXISTS news_keywords ("
+            "keyword TEXT PRIMARY KEY, newest_published_at TEXT, "
+            "last_attempt REAL NOT NULL DEFAULT 0, failures INTEGER NOT NULL DEFAULT 0);"
+            "CREATE TABLE IF NOT EXISTS news_requests (requested_at REAL NOT NULL);"
+            # publishedAt ranges a full page cut off, still to be paged through.
+            "CREATE TABLE IF NOT EXISTS news_gaps (id INTEGER PRIMARY KEY, "
+            "keyword TEXT NOT NULL, gap_from TEXT NOT NULL, gap_to TEXT NOT NULL);"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(news_articles)")}
+        # MinHash signature and cluster representative; NULL duplicate_of marks a representative.
+        if "signature" not in columns:
+            self._db.execute("ALTER TABLE news_articles ADD COLUMN signature BLOB")
+        if "duplicate_of" not in columns:
+            self._db.execute("ALTER TABLE news_articles ADD COLUMN duplicate_of INTEGER")
+        # Store-wide change counter, bumped on every insert or update, so readers in any
+        # process can pick up edited rows as well as new ones.
+        if "revision" not in columns:
+            self._db.execute("ALTER TABLE news_articles ADD COLUMN revision INTEGER")
+            self._db.execute("UPDATE news_articles SET revision = id")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS news_articles_revision ON news_articles (revision)"
+        )
+        self._db.commit()
+
+    def upsert_articles(self, keyword, articles, near_duplicates=None):
+        """
+        Insert new articles and refresh the fields of ones already stored.
+
+        Args:
+            keyword (str): Query the articles came from
+            articles (list[dict]): Articles in NewsAPI shape
+            near_duplicates (NearDuplicateIndex | None): When given, each new
+                article is signed and, if it repeats a stored story, recorded
+                as a duplicate of that story's representative
+
+        Returns:
+            list[dict]: The articles that were not in the store before, with ids
+        """
+        now = time.time()
+        added = []
+        with self._lock:
+            for article in articles:
+                url = article.get("url")
+                title = article.get("title")
+                if not url or not title or title == "[Removed]":
+                    continue
+                row = (
+                    title,
+                    article.get("description"),
+                    (article.get("source") or {}).get("name"),
+                    article.get("author"),
+                    article.get("urlToImage"),
+                    article.get("publishedAt") or "",
+                )
+                existing = self._db.execute(
+                    "SELECT id FROM news_articles WHERE url = ?", (url,)
+                ).fetchone()
+                if existing:
+                    self._db.execute(
+                        "UPDATE news_articles SET title = ?, description = ?, source = ?, "
+                        f"author = ?, image_url = ?, published_at = ?, revision = {_NEXT_REVISION} "
+                        "WHERE id = ?",
+                        row + (existing[0],),
+                    )
+                    continue
+                signature = representative = None
+                if near_duplicates is not None:
+                    signature, representative = near_duplicates.classify(article)
+                cursor = self._db.execute(
+                    "INSERT INTO news_articles (url, title, description, source, author, "
+                    "image_url, published_at, keyword, ingested_at, signature, duplicate_of, "
+                    f"revision) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {_NEXT_REVISION})",
+                    (url,) + row + (
+                        keyword,
+                        now,
+                        signature,
+                        representative,
+                    ),
+                )
+                if signature and representative is None:
+                    # Later copies in the same batch cluster onto this one.
+                    near_duplicates.add_packed(cursor.lastrowid, signature)
+                added.append(_to_article((cursor.lastrowid, url) + row))
+            self._db.commit()
+        return added
+
+    def latest(self, limit):
+        """Return the newest stories (one representative per cluster), newest first."""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_ARTICLE_COLUMNS} FROM news_articles WHERE duplicate_of IS NULL "
+                "ORDER BY published_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [_to_article(row) for row in rows]
+
+    def changes_after(self, revision):
+        """
+        Return articles inserted or updated since revision, in revision order.
+
+        Returns:
+            list[tuple[int, dict, bool]]: (revision, article, whether the article
+            is a cluster representative) per changed row
+        """
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT revision, duplicate_of IS NULL, {_ARTICLE_COLUMNS} FROM news_articles "
+                "WHERE revision > ? ORDER BY revision",
+                (revision,),
+            ).fetchall()
+        return [(row[0], _to_article(row[2:]), bool(row[1])) for row in rows]
+
+    def signatures_after(self, revision):
+        """
+        Return signed rows inserted or updated since revision, in revision order.
+
+        Returns:
+            list[tuple[int, int, bytes, bool]]: (revision, id, signature, whether
+            the article is a cluster representative) per changed row
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT revision, id, signature, duplicate_of IS NULL FROM news_articles "
+                "WHERE revision > ? AND signature IS NOT NULL ORDER BY revision",
+                (revision,),
+            ).fetchall()
+        return [(rev, article_id, blob, bool(representative)) for rev, article_id, blob, representative in rows]
+
+    def clear_signatures_except(self, version_prefix):
+        """Drop signatures that do not start with version_prefix so they are re-signed."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE news_articles SET signature = NULL, duplicate_of = NULL "
+                "WHERE signature IS NOT NULL AND substr(signature, 1, ?) != ?",
+                (len(version_prefix), version_prefix),
+            )
+            self._db.commit()
+
+    def unsigned_articles(self):
+        """Return articles stored without a MinHash signature, oldest first."""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_ARTICLE_COLUMNS} FROM news_articles "
+                "WHERE signature IS NULL ORDER BY id"
+            ).fetchall()
+        return [_to_article(row) for row in rows]
+
+    def set_signature(self, article_id, signature, duplicate_of):
+        """Store an article's signature and the representative it duplicates, if any."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE news_articles SET signature = ?, duplicate_of = ?, "
+                f"revision = {_NEXT_REVISION} WHERE id = ?",
+                (signature, duplicate_of, article_id),
+            )
+            self._db.commit()
+
+    def articles_by_id(self, article_ids):
+        """Return the articles with the given ids, in the order given."""
+        if not article_ids:
+            return []
+        placeholders = ", ".join("?" * len(article_ids))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_ARTICLE_COLUMNS} FROM news_articles WHERE id IN ({placeholders})",
+                list(article_ids),
+            ).fetchall()
+        by_id = {row[0]: _to_article(row) for row in rows}
+        return [by_id[article_id] for article_id in article_ids if article_id in by_id]
+
+    def stats(self):
+        """
+        Summarise the store for the news page.
+
+        Returns:
+            dict: story count (cluster representatives), near-duplicate count
+            and when the newest article was ingested (None if empty)
+        """
+        with self._lock:
+            count, duplicates, last_ingested_at = self._db.execute(
+                "SELECT COUNT(*) - COUNT(duplicate_of), COUNT(duplicate_of), MAX(ingested_at) "
+                "FROM news_articles"
+            ).fetchone()
+        return {
+            "articles": count,
+            "duplicates": duplicates,
+            "last_ingested_at": last_ingested_at,
+        }
+
+    def claim_due_keywords(self, keywords, interval_seconds, daily_budget, limit):
+        """
+        Reserve keywords whose turn has come, within the shared daily request budget.
+
+        A keyword is due when it was last queried at least interval_seconds ago;
+        the most overdue go first. Claimed keywords are stamped and logged as
+        requests in the same transaction, so concurrent workers never pick the
+        same keyword or overspend the budget.
+
+        Returns:
+            list[tuple[str, str | None]]: (keyword, newest publishedAt seen) pairs
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "DELETE FROM news_requests WHERE requested_at < ?", (now - 86400,)
+                )
+                used = self._db.execute("SELECT COUNT(*) FROM news_requests").fetchone()[0]
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO news_keywords (keyword) VALUES (?)",
+                    [(keyword,) for keyword in keywords],
+                )
+                placeholders = ", ".join("?" * len(keywords))
+                rows = self._db.execute(
+                    "SELECT keyword, newest_published_at FROM news_keywords "
+                    f"WHERE keyword IN ({placeholders}) AND last_attempt <= ? "
+                    "ORDER BY last_attempt LIMIT ?",
+                    (*keywords, now - interval_seconds, max(0, min(limit, daily_budget - used))),
+                ).fetchall()
+                self._db.executemany(
+                    "UPDATE news_keywords SET last_attempt = ? WHERE keyword = ?",
+                    [(now, keyword) for keyword, _ in rows],
+                )
+                self._db.executemany(
+                    "INSERT INTO news_requests (requested_at) VALUES (?)",
+                    [(now,)] * len(rows),
+                )
+                self._db.commit()
+            except Exception:
+                self._db.rollback()
+                raise
+        return rows
+
+    def reserve_request(self, daily_budget):
+        """Log one more upstream request if the shared daily budget allows it."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                used = self._db.execute(
+                    "SELECT COUNT(*) FROM news_requests WHERE requested_at >= ?", (now - 86400,)
+                ).fetchone()[0]
+                reserved = used < daily_budget
+                if reserved:
+                    self._db.execute("INSERT INTO news_requests (requested_at) VALUES (?)", (now,))
+                self._db.commit()
+            except Exception:
+                self._db.rollback()
+                raise
+        return reserved
+
+    def next_due_in(self, keywords, interval_seconds):
+        """Seconds until the next keyword becomes due (0 if one already is)."""
+        placeholders = ", ".join("?" * len(keywords))
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT COUNT(*), MIN(last_attempt) FROM news_keywords "
+                f"WHERE keyword IN ({placeholders})",
+                keywords,
+            ).fetchone()
+        if row[0] < len(keywords):
+            return 0.0
+        return max(0.0, row[1] + interval_seconds - time.time())
+
+    def record_success(self, keyword, newest_published_at):
+        """Advance the keyword's incremental cursor and clear its failure count."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE news_keywords SET failures = 0, "
+                "newest_published_at = MAX(COALESCE(newest_published_at, ''), ?) "
+                "WHERE keyword = ?",
+                (newest_published_at or "", keyword),
+            )
+            self._db.commit()
+
+    def add_gap(self, keyword, gap_from, gap_to):
+        """Record a publishedAt range of keyword matches that was cut off by a full page."""
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO news_gaps (keyword, gap_from, gap_to) VALUES (?, ?, ?)",
+                (keyword, gap_from, gap_to),
+            )
+            self._db.commit()
+
+    def gaps(self, keywords):
+        """Return (id, keyword, from, to) of the keywords' open gaps, newest first."""
+        placeholders = ", ".join("?" * len(keywords))
+        with self._lock:
+            return self._db.execute(
+                "SELECT id, keyword, gap_from, gap_to FROM news_gaps "
+                f"WHERE keyword IN ({placeholders}) ORDER BY gap_to DESC",
+                list(keywords),
+            ).fetchall()
+
+    def narrow_gap(self, gap_id, gap_to):
+        """Move a gap's upper bound down after a page, or close it when gap_to is None."""
+        with self._lock:
+            if gap_to is None:
+                self._db.execute("DELETE FROM news_gaps WHERE id = ?", (gap_id,))
+            else:
+                self._db.execute("UPDATE news_gaps SET gap_to = ? WHERE id = ?", (gap_to, gap_id))
+            self._db.commit()
+
+    def record_failure(self, keyword, retry_after_seconds, interval_seconds):
+        """Count a failed query and schedule the keyword's retry after retry_after_seconds."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE news_keywords SET failures = failures + 1, last_attempt = ? "
+                "WHERE keyword = ?",
+                (time.time() + retry_after_seconds - interval_seconds, keyword),
+            )
+            self._db.commit()
+
+    def requests_today(self):
+        """Return how many upstream requests were made in the last 24 hours."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM news_requests WHERE requested_at >= ?",
+                (time.time() - 86400,),
+            ).fetchone()[0]
+
+
+article_store = ArticleStore(NEWS_STORE_DB_PATH)
@@ -0,0 +1,71 @@
+"""
+Render cache module for Career Guidance Chatbot
+Memoized preparation of chat message markdown so reruns reuse earlier work
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+from config import RENDER_CACHE_MAX_ENTRIES
+
+# "$50k to $80k" would otherwise be rendered as a LaTeX span.
+_CURRENCY_DOLLAR = re.compile(r"(?<!\\)\$(?=\s?\d)")
+_TRAILING_SPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+_EXTRA_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def prepare_markdown(text):
+    """
+    Normalize model output for st.markdown.
+
+    Escapes currency dollar signs, strips trailing whitespace and collapses
+    runs of blank lines, which model output often contains.
+    """
+    text = _CURRENCY_DOLLAR.sub(r"\\$", text.strip())
+    text = _TRAILING_SPACE.sub("", text)
+    return _EXTRA_BLANK_LINES.sub("\n\n", text)
+
+
+class MarkdownCache:
+    """Thread-safe LRU from a message's content hash to its prepared markdown."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text):
+        """Return prepared markdown for text, preparing it only on first sight."""
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            prepared = self._entries.get(key)
+            if prepared is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return prepared
+            self.misses += 1
+
+        prepared = prepare_markdown(text)
+        with self._lock:
+            self._entries[key] = prepared
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return prepared
+
+    def stats(self):
+        """Return hit/miss counters and the current entry count."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+markdown_cache = MarkdownCache(RENDER_CACHE_MAX_ENTRIES)
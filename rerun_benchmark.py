@@ -0,0 +1,237 @@
+"""
+Rerun benchmark for Career Guidance Chatbot
+Measures server CPU and websocket bytes per chat interaction, with and without fragments
+
+Starts the app headless against the local Gemini mock, connects over the same
+websocket protocol the browser uses, submits chat messages and reads the app's
+own rerun metrics from /metrics. Each mode runs in a fresh server process.
+
+Run with: python rerun_benchmark.py --turns 20
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.websocket import websocket_connect
+
+APP_SCRIPT = "demo2.py"
+SCRIPT_DONE = {
+    ForwardMsg.FINISHED_SUCCESSFULLY,
+    ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+    ForwardMsg.FINISHED_WITH_COMPILE_ERROR,
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _process_cpu_seconds(pid):
+    """User plus system CPU of a process, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/stat") as handle:
+            fields = handle.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _rerun_cpu_seconds(metrics_port):
+    """Sum of script-thread CPU over all reruns, as reported by the app."""
+    url = f"http://127.0.0.1:{metrics_port}/metrics"
+    with urllib.request.urlopen(url, timeout=5) as response:
+        for line in response.read().decode("utf-8").splitlines():
+            if line.startswith("streamlit_rerun_cpu_seconds_sum"):
+                return float(line.split()[-1])
+    return 0.0
+
+
+def _wait_healthy(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=2):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("Streamlit server did not become healthy")
+
+
+def _start_server(fragments):
+    port = _free_port()
+    metrics_port = _free_port()
+    env = dict(
+        os.environ,
+        GEMINI_MOCK="1",
+        GEMINI_MOCK_PORT=str(_free_port()),
+        GEMINI_MOCK_TTFT_SECONDS="0",
+        GEMINI_MOCK_CHUNK_DELAY_SECONDS="0",
+        STREAMLIT_FRAGMENTS="1" if fragments else "0",
+        METRICS_PORT=str(metrics_port),
+        RERUN_METRICS="1",
+        RESPONSE_CACHE_ENABLED="0",
+        CONVERSATION_STORE_ENABLED="0",
+    )
+    command = [
+        sys.executable,
+        "-m",
+        "streamlit",
+        "run",
+        APP_SCRIPT,
+        "--server.headless=true",
+        f"--server.port={port}",
+        "--server.enableXsrfProtection=false",
+        "--browser.gatherUsageStats=false",
+    ]
+    process = subprocess.Popen(
+        command,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_healthy(port)
+    except Exception:
+        process.kill()
+        raise
+    return process, port, metrics_port
+
+
+class _Session:
+    """Minimal browser stand-in speaking Streamlit's websocket protocol."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.chat_input_id = None
+        self.chat_fragment_id = ""
+
+    async def rerun(self, widget_states=None, fragment_id=""):
+        """Request a (fragment) rerun and return the bytes received until it finishes."""
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.fragment_id = fragment_id
+        for widget in widget_states or ():
+            client_state.widget_states.widgets.append(widget)
+        await self.connection.write_message(message.SerializeToString(), binary=True)
+
+        received = 0
+        while True:
+            data = await self.connection.read_message()
+            if data is None:
+                raise RuntimeError("Websocket closed during rerun")
+            received += len(data)
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                if element.WhichOneof("type") == "chat_input":
+                    self.chat_input_id = element.chat_input.id
+                    self.chat_fragment_id = forward.delta.fragment_id
+            elif kind == "script_finished" and forward.script_finished in SCRIPT_DONE:
+                return received
+
+    async def send_chat(self, text):
+        message = BackMsg()
+        widget = message.rerun_script.widget_states.widgets.add()
+        widget.id = self.chat_input_id
+        widget.string_trigger_value.data = text
+        return await self.rerun([widget], fragment_id=self.chat_fragment_id)
+
+
+async def _drive(port, turns, warmup, snapshot):
+    """Chat through one session; snapshot() is taken after warm-up and at the end."""
+    connection = await websocket_connect(f"ws://127.0.0.1:{port}/_stcore/stream")
+    session = _Session(connection)
+    try:
+        await session.rerun()
+        if session.chat_input_id is None:
+            raise RuntimeError("Chat input not found on the home page")
+        samples = []
+        before = None
+        for turn in range(warmup + turns):
+            if turn == warmup:
+                before = snapshot()
+            started = time.perf_counter()
+            received = await session.send_chat(
+                f"How should I prepare for a backend developer role? Step {turn + 1}"
+            )
+            if turn >= warmup:
+                samples.append((time.perf_counter() - started, received))
+        return samples, before, snapshot()
+    finally:
+        connection.close()
+
+
+def run_mode(fragments, turns, warmup=2):
+    """Benchmark one mode in its own server process and return per-turn averages."""
+    process, port, metrics_port = _start_server(fragments)
+
+    def snapshot():
+        return _process_cpu_seconds(process.pid), _rerun_cpu_seconds(metrics_port)
+
+    try:
+        # Warm-up turns load the Gemini client and mock before measuring.
+        samples, before, after = asyncio.run(_drive(port, turns, warmup, snapshot))
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    (cpu_before, rerun_before), (cpu_after, rerun_after) = before, after
+    return {
+        "mode": "fragments" if fragments else "full reruns",
+        "turns": turns,
+        "process_cpu_ms": (
+            (cpu_after - cpu_before) * 1000 / turns if cpu_before is not None else None
+        ),
+        "script_cpu_ms": (rerun_after - rerun_before) * 1000 / turns,
+        "latency_ms": sum(s[0] for s in samples) * 1000 / turns,
+        "ws_bytes": sum(s[1] for s in samples) / turns,
+    }
+
+
+def _format(value, digits=1):
+    return "n/a" if value is None else f"{value:.{digits}f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare per-chat-turn server cost with and without fragment reruns."
+    )
+    parser.add_argument("--turns", type=int, default=20, help="Chat messages per mode")
+    parser.add_argument(
+        "--mode",
+        choices=["both", "fragments", "full"],
+        default="both",
+        help="Which rerun mode(s) to benchmark",
+    )
+    args = parser.parse_args()
+
+    modes = {"both": [False, True], "fragments": [True], "full": [False]}[args.mode]
+    results = [run_mode(fragments, args.turns) for fragments in modes]
+
+    print(f"{'mode':<14}{'process CPU ms':>16}{'script CPU ms':>15}{'latency ms':>12}{'ws bytes':>10}")
+    for result in results:
+        print(
+            f"{result['mode']:<14}"
+            f"{_format(result['process_cpu_ms']):>16}"
+            f"{_format(result['script_cpu_ms']):>15}"
+            f"{_format(result['latency_ms']):>12}"
+            f"{_format(result['ws_bytes'], 0):>10}"
+        )
+    print("Per chat turn, averaged; the mock answers instantly so model time is excluded.")
+
+
+if __name__ == "__main__":
+    main()
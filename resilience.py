@@ -0,0 +1,386 @@
+"""
+Resilience module for Career Guidance Chatbot
+Quota-aware retries, circuit breaking and hedged requests for every Gemini call
+"""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from google.genai import errors
+from coalesce import CoalescedRequestCancelled
+from concurrency import LimiterTimeout
+from config import (
+    GEMINI_RETRY_ATTEMPTS,
+    GEMINI_RETRY_BASE_DELAY_SECONDS,
+    GEMINI_RETRY_MAX_DELAY_SECONDS,
+    GEMINI_BREAKER_FAILURE_THRESHOLD,
+    GEMINI_BREAKER_COOLDOWN_SECONDS,
+    GEMINI_HEDGE_AFTER_SECONDS,
+)
+
+_END = object()
+_RETRY_DELAY = re.compile(r"^\s*([\d.]+)s\s*$")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling Gemini while the circuit breaker is open."""
+
+
+def is_quota_error(exc):
+    """Return True if exc means the Gemini quota or rate limit is exhausted."""
+    if isinstance(exc, errors.APIError):
+        return exc.code == 429 or exc.status == "RESOURCE_EXHAUSTED"
+    return False
+
+
+def is_unavailable_error(exc):
+    """Return True if Gemini should be treated as unavailable and a fallback shown."""
+    if isinstance(exc, (CircuitOpenError, LimiterTimeout, CoalescedRequestCancelled)):
+        return True
+    return _is_transient(exc)
+
+
+def _is_transient(exc):
+    """Errors worth retrying and counting against the breaker."""
+    if is_quota_error(exc):
+        return True
+    if isinstance(exc, errors.APIError):
+        return isinstance(exc.code, int) and exc.code >= 500
+    return isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+def retry_after_seconds(exc):
+    """
+    Extract the server's retry hint from a Gemini error, if any.
+
+    Checks the Retry-After header first, then the RetryInfo detail that the
+    API attaches to RESOURCE_EXHAUSTED responses.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+    details = getattr(exc, "details", None) or {}
+    error_body = details.get("error", details) if isinstance(details, dict) else {}
+    for item in error_body.get("details", []) or []:
+        if isinstance(item, dict) and "retryDelay" in item:
+            match = _RETRY_DELAY.match(str(item["retryDelay"]))
+            if match:
+                return float(match.group(1))
+    return None
+
+
+def backoff_delay(attempt, hint=None):
+    """Full-jitter exponential backoff, never shorter than the server's hint."""
+    ceiling = min(GEMINI_RETRY_MAX_DELAY_SECONDS, GEMINI_RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
+    delay = random.uniform(0, ceiling)
+    if hint is not None:
+        delay = max(delay, hint)
+    return delay
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with a single half-open probe.
+
+    After the failure threshold is reached every call fails fast until the
+    cooldown (or the server's longer retry hint) has passed; then one probe
+    call is let through and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold, cooldown_seconds):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = None
+        self._probing = False
+        self.trips = 0
+        self.rejected = 0
+
+    def allow(self):
+        """Return True if a call may proceed now."""
+        return self.admit() is not None
+
+    def admit(self):
+        """
+        Admit a call if the circuit allows it.
+
+        Returns:
+            str | None: "probe" for the single half-open probe, "call" for a
+            call through the closed circuit, None if the call is rejected
+        """
+        with self._lock:
+            if self._open_until is None:
+                return "call"
+            if time.monotonic() >= self._open_until and not self._probing:
+                self._probing = True
+                return "probe"
+            self.rejected += 1
+            return None
+
+    def release_probe(self):
+        """
+        Free the half-open probe slot without judging the service.
+
+        For a probe that ended for a reason that says nothing about Gemini's
+        health (bad request, local timeout, cancellation); the next call
+        becomes the probe instead.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._open_until = None
+            self._probing = False
+
+    def record_failure(self, retry_after=None):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                cooldown = max(self.cooldown_seconds, retry_after or 0)
+                self._open_until = time.monotonic() + cooldown
+                self._probing = False
+                self.trips += 1
+
+    def state(self):
+        """Return 'closed', 'open' or 'half_open'."""
+        with self._lock:
+            if self._open_until is None:
+                return "closed"
+            if time.monotonic() >= self._open_until:
+                return "half_open"
+            return "open"
+
+    def stats(self):
+        return {
+            "state": self.state(),
+            "consecutive_failures": self._failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+gemini_breaker = CircuitBreaker(GEMINI_BREAKER_FAILURE_THRESHOLD, GEMINI_BREAKER_COOLDOWN_SECONDS)
+_hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="gemini-hedge")
+
+
+def _start(producer):
+    iterator = iter(producer())
+    return iterator, next(iterator, _END)
+
+
+def _close_loser(future):
+    if future.exception() is None:
+        iterator, _ = future.result()
+        iterator.close()
+
+
+def _open_stream(producer, hedge_after):
+    """Start the producer and return (iterator, first chunk), hedging a slow start."""
+    if not hedge_after:
+        return _start(producer)
+
+    primary = _hedge_pool.submit(_start, producer)
+    done, _ = wait([primary], timeout=hedge_after)
+    if done:
+        return primary.result()
+
+    pending = {primary, _hedge_pool.submit(_start, producer)}
+    winner = None
+    error = None
+    while pending and winner is None:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is not None:
+                error = future.exception()
+            elif winner is None:
+                winner = future.result()
+            else:
+                _close_loser(future)
+    for future in pending:
+        future.add_done_callback(_close_loser)
+    if winner is None:
+        raise error
+    return winner
+
+
+def _check_breaker(breaker):
+    """Raise CircuitOpenError if the call is rejected; return True if it is the probe."""
+    admission = breaker.admit()
+    if admission is None:
+        raise CircuitOpenError("Gemini is temporarily unavailable (circuit open)")
+    return admission == "probe"
+
+
+def resilient_stream(producer, breaker=gemini_breaker, hedge_after=GEMINI_HEDGE_AFTER_SECONDS):
+    """
+    Yield chunks from producer with retries, circuit breaking and hedging.
+
+    Retries only happen before the first chunk arrives; once output has been
+    yielded, a mid-stream failure is counted and re-raised.
+
+    Args:
+        producer (callable): Zero-argument callable returning an iterator of chunks
+        breaker (CircuitBreaker): Breaker guarding the upstream service
+        hedge_after (float | None): Seconds to wait for a first chunk before
+            starting a backup request; None disables hedging
+
+    Yields:
+        str: Chunks from the first producer attempt that succeeds
+    """
+    for attempt in range(GEMINI_RETRY_ATTEMPTS):
+        probe = _check_breaker(breaker)
+        try:
+            iterator, first = _open_stream(producer, hedge_after)
+            break
+        except Exception as exc:
+            if not _is_transient(exc):
+                # Not the service's fault (bad request, local queue timeout): leave the
+                # failure count as is, but let another call probe the circuit.
+                if probe:
+                    breaker.release_probe()
+                raise
+            hint = retry_after_seconds(exc)
+            breaker.record_failure(hint)
+            if attempt + 1 >= GEMINI_RETRY_ATTEMPTS or (hint or 0) > GEMINI_RETRY_MAX_DELAY_SECONDS:
+                raise
+            time.sleep(backoff_delay(attempt, hint))
+        except BaseException:
+            if probe:
+                breaker.release_probe()
+            raise
+
+    try:
+        if first is not _END:
+            yield first
+            yield from iterator
+    except GeneratorExit:
+        # The consumer stopped reading; the upstream call itself was healthy.
+        breaker.record_success()
+        iterator.close()
+        raise
+    except Exception as exc:
+        if _is_transient(exc):
+            breaker.record_failure(retry_after_seconds(exc))
+        elif probe:
+            breaker.release_probe()
+        raise
+    except BaseException:
+        if probe:
+            breaker.release_probe()
+        raise
+    breaker.record_success()
+
+
+async def _astart(producer):
+    iterator = producer().__aiter__()
+    try:
+        return iterator, await iterator.__anext__()
+    except StopAsyncIteration:
+        return iterator, _END
+
+
+async def _aclose_loser(task):
+    if task.done() and not task.cancelled() and task.exception() is None:
+        iterator, _ = task.result()
+        await iterator.aclose()
+    else:
+        task.cancel()
+
+
+async def _aopen_stream(producer, hedge_after):
+    """Async variant of _open_stream."""
+    if not hedge_after:
+        return await _astart(producer)
+
+    primary = asyncio.ensure_future(_astart(producer))
+    done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+    if done:
+        return primary.result()
+
+    pending = {primary, asyncio.ensure_future(_astart(producer))}
+    winner = None
+    error = None
+    while pending and winner is None:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is not None:
+                error = task.exception()
+            elif winner is None:
+                winner = task.result()
+            else:
+                await _aclose_loser(task)
+    for task in pending:
+        await _aclose_loser(task)
+    if winner is None:
+        raise error
+    return winner
+
+
+async def aresilient_stream(producer, breaker=gemini_breaker, hedge_after=GEMINI_HEDGE_AFTER_SECONDS):
+    """
+    Async variant of resilient_stream.
+
+    Args:
+        producer (callable): Zero-argument callable returning an async iterator
+        breaker (CircuitBreaker): Breaker guarding the upstream service
+        hedge_after (float | None): Seconds before a backup request is started
+
+    Yields:
+        str: Chunks from the first producer attempt that succeeds
+    """
+    for attempt in range(GEMINI_RETRY_ATTEMPTS):
+        probe = _check_breaker(breaker)
+        try:
+            iterator, first = await _aopen_stream(producer, hedge_after)
+            break
+        except Exception as exc:
+            if not _is_transient(exc):
+                # Not the service's fault (bad request, local queue timeout): leave the
+                # failure count as is, but let another call probe the circuit.
+                if probe:
+                    breaker.release_probe()
+                raise
+            hint = retry_after_seconds(exc)
+            breaker.record_failure(hint)
+            if attempt + 1 >= GEMINI_RETRY_ATTEMPTS or (hint or 0) > GEMINI_RETRY_MAX_DELAY_SECONDS:
+                raise
+            await asyncio.sleep(backoff_delay(attempt, hint))
+        except BaseException:
+            if probe:
+                breaker.release_probe()
+            raise
+
+    try:
+        if first is not _END:
+            yield first
+            async for chunk in iterator:
+                yield chunk
+    except (GeneratorExit, asyncio.CancelledError):
+        breaker.record_success()
+        await iterator.aclose()
+        raise
+    except Exception as exc:
+        if _is_transient(exc):
+            breaker.record_failure(retry_after_seconds(exc))
+        elif probe:
+            breaker.release_probe()
+        raise
+    except BaseException:
+        if probe:
+            breaker.release_probe()
+        raise
+    breaker.record_success()
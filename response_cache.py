@@ -0,0 +1,173 @@
+"""
+Response cache module for Career Guidance Chatbot
+LRU + TTL cache of model answers with an optional SQLite tier that survives restarts
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config import (
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTL_SECONDS,
+    RESPONSE_CACHE_DB_PATH,
+    RESPONSE_CACHE_DB_MAX_ENTRIES,
+)
+
+
+def _normalize(text):
+    """Collapse whitespace and case so trivially different inputs share a key."""
+    return " ".join((text or "").split()).casefold()
+
+
+def make_cache_key(model, system_prompt, history_window, user_input):
+    """
+    Build a stable cache key for one generation request.
+
+    Args:
+        model (str): Model name the request is sent to
+        system_prompt (str): System instruction
+        history_window (list[tuple[str, str]]): (role, text) pairs actually sent
+        user_input (str): Current user message
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    payload = json.dumps(
+        [
+            model,
+            _normalize(system_prompt),
+            [[role, _normalize(text)] for role, text in history_window],
+            _normalize(user_input),
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe in-memory LRU with TTL, backed by an optional SQLite table."""
+
+    def __init__(self, max_entries, ttl_seconds, db_path=None, db_max_entries=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_max_entries = db_max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _remember(self, key, response, created_at):
+        self._entries[key] = (response, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        """Return the cached response for key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                response, created_at = item
+                if now - created_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    return response
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT response, created_at FROM response_cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row and now - row[1] <= self.ttl_seconds:
+                    self._remember(key, row[0], row[1])
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, response):
+        """Store a completed response in memory and, if configured, on disk."""
+        if not response:
+            return
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, response, created_at) VALUES (?, ?, ?)",
+                    (key, response, now),
+                )
+                self._prune_disk(now)
+                self._db.commit()
+
+    def _prune_disk(self, now):
+        self._db.execute(
+            "DELETE FROM response_cache WHERE created_at < ?",
+            (now - self.ttl_seconds,),
+        )
+        if self.db_max_entries:
+            self._db.execute(
+                "DELETE FROM response_cache WHERE key NOT IN ("
+                "SELECT key FROM response_cache ORDER BY created_at DESC LIMIT ?)",
+                (self.db_max_entries,),
+            )
+
+    def clear(self):
+        """Drop every cached entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM response_cache")
+                self._db.commit()
+
+    def stats(self):
+        """
+        Report cache effectiveness counters.
+
+        Returns:
+            dict: hits, misses, hit rate and current in-memory size
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+response_cache = ResponseCache(
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=RESPONSE_CACHE_TTL_SECONDS,
+    db_path=RESPONSE_CACHE_DB_PATH,
+    db_max_entries=RESPONSE_CACHE_DB_MAX_ENTRIES,
+) if RESPONSE_CACHE_ENABLED else None
+
+
+def cache_stats():
+    """Return counters of the shared response cache, or an empty dict when disabled."""
+    if response_cache is None:
+        return {}
+    return response_cache.stats()
@@ -0,0 +1,261 @@
+"""
+Roadmap search module for Career Guidance Chatbot
+Prebuilt prefix-trie and trigram index for ranked, typo-tolerant roadmap lookup
+"""
+
+import re
+import threading
+from collections import Counter, OrderedDict
+
+# Extra search terms per roadmap.sh slug: abbreviations, alternate spellings and
+# the job titles students tend to type instead of the roadmap name.
+ROADMAP_ALIASES = {
+    "frontend": ["front end", "web developer", "ui developer"],
+    "backend": ["back end", "server side"],
+    "full-stack": ["fullstack", "mern", "web development"],
+    "devops": ["sre", "site reliability", "ci cd"],
+    "ai-data-scientist": ["machine learning", "ml", "data science", "ai"],
+    "data-analyst": ["analytics", "business analyst", "power bi"],
+    "android": ["kotlin", "mobile"],
+    "ios": ["mobile", "apple"],
+    "cyber-security": ["cybersecurity", "security", "infosec", "ethical hacking"],
+    "blockchain": ["web3", "crypto", "solidity"],
+    "qa": ["testing", "tester", "quality assurance", "automation testing"],
+    "system-design": ["scalability", "distributed systems"],
+    "python": ["py", "django", "flask"],
+    "javascript": ["js", "ecmascript"],
+    "typescript": ["ts"],
+    "react": ["reactjs", "react js"],
+    "nodejs": ["node", "node js", "express"],
+    "aws": ["amazon web services", "cloud"],
+    "kubernetes": ["k8s", "kube"],
+    "docker": ["containers"],
+    "computer-science": ["cs", "cse", "computer engineering"],
+    "vue": ["vuejs", "vue js"],
+    "angular": ["angularjs"],
+    "aspnet-core": ["dotnet", ".net", "c#", "csharp"],
+    "api-design": ["rest", "rest api"],
+    "spring-boot": ["spring"],
+    "flutter": ["dart"],
+    "cpp": ["c plus plus", "cplusplus"],
+    "go": ["golang"],
+    "design-system": ["software architecture", "design patterns"],
+    "prompt-engineering": ["prompting", "llm", "genai", "generative ai"],
+    "mongodb": ["mongo", "nosql"],
+    "terraform": ["infrastructure as code", "iac"],
+    "dsa": ["algorithms", "data structures", "leetcode", "competitive programming"],
+    "git-github": ["git", "github", "version control"],
+    "ai-agents": ["agents", "agentic ai"],
+    "swift": ["swiftui"],
+    "bash": ["shell", "shell scripting", "scripting"],
+    "elasticsearch": ["elastic", "elk"],
+}
+
+_NON_ALNUM = re.compile(r"[^a-z0-9#+.]+")
+
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.8
+SUBSTRING_SCORE = 0.6
+FUZZY_SCORE = 0.75
+MIN_FUZZY_SIMILARITY = 0.45
+# Below MIN_FUZZY_SIMILARITY a match is still accepted if it is one typo away.
+MIN_TYPO_SIMILARITY = 0.3
+RESULT_CACHE_SIZE = 256
+
+
+def normalize(text):
+    """Lowercase text and collapse punctuation and separators into single spaces."""
+    return _NON_ALNUM.sub(" ", (text or "").lower()).strip()
+
+
+def _trigrams(term):
+    padded = f"  {term} "
+    return Counter(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def _within_one_edit(a, b):
+    """True if a and b differ by at most one insertion, deletion, substitution or swap."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    start = 0
+    while start < len(a) and a[start] == b[start]:
+        start += 1
+    if start == len(a):
+        return True
+    if len(a) < len(b):
+        return a[start:] == b[start + 1 :]
+    if a[start + 1 :] == b[start + 1 :]:
+        return True
+    return (
+        start + 1 < len(a)
+        and a[start] == b[start + 1]
+        and a[start + 1] == b[start]
+        and a[start + 2 :] == b[start + 2 :]
+    )
+
+
+class RoadmapEntry:
+    """One roadmap.sh roadmap with the search terms that lead to it."""
+
+    __slots__ = ("name", "slug", "terms", "order")
+
+    def __init__(self, name, slug, order):
+        self.name = name
+        self.slug = slug
+        self.terms = []
+        self.order = order
+
+
+class _TrieNode:
+    __slots__ = ("children", "matches")
+
+    def __init__(self):
+        self.children = {}
+        # entry index -> length of the shortest indexed term through this node
+        self.matches = {}
+
+
+class RoadmapIndex:
+    """
+    Search index over roadmap names, slugs and aliases.
+
+    Built once from one or more {name: slug} catalogs. Entries sharing a slug
+    are merged, the first name winning and later names becoming aliases.
+    Every term and every word in it goes into a prefix trie whose nodes
+    store the entries below them, so prefix lookups walk only the query's
+    characters; terms and their words also go into a trigram index for fuzzy
+    and substring matching.
+    """
+
+    def __init__(self, catalogs, aliases=None):
+        self.entries = []
+        by_slug = {}
+        for catalog in catalogs:
+            for name, slug in catalog.items():
+                entry = by_slug.get(slug)
+                if entry is None:
+                    entry = RoadmapEntry(name, slug, len(self.entries))
+                    by_slug[slug] = entry
+                    self.entries.append(entry)
+                entry.terms.append(name)
+        for slug, extra in (aliases or {}).items():
+            if slug in by_slug:
+                by_slug[slug].terms.extend(extra)
+
+        # Reruns repeat the same query, so recent results are kept.
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self._trie = _TrieNode()
+        self._exact = {}
+        self._terms = []
+        self._postings = {}
+        for index, entry in enumerate(self.entries):
+            terms = {normalize(term) for term in entry.terms}
+            terms.add(normalize(entry.slug.replace("-", " ")))
+            terms.discard("")
+            for term in sorted(terms):
+                self._add_term(index, term)
+
+    def _add_term(self, index, term):
+        self._exact.setdefault(term, set()).add(index)
+        words = term.split()
+        for start in range(len(words)):
+            self._insert_prefix(" ".join(words[start:]), index, len(term))
+
+        # Single words are indexed too, so a typo in one word of a long name still matches.
+        for text in {term, *words}:
+            term_id = len(self._terms)
+            grams = _trigrams(text)
+            self._terms.append((index, text, sum(grams.values())))
+            for gram, count in grams.items():
+                self._postings.setdefault(gram, []).append((term_id, count))
+
+    def _insert_prefix(self, text, index, term_length):
+        node = self._trie
+        for char in text:
+            node = node.children.setdefault(char, _TrieNode())
+            shortest = node.matches.get(index)
+            if shortest is None or term_length < shortest:
+                node.matches[index] = term_length
+
+    def _prefix_matches(self, query):
+        node = self._trie
+        for char in query:
+            node = node.children.get(char)
+            if node is None:
+                return {}
+        return node.matches
+
+    def search(self, query, limit=None):
+        """
+        Rank roadmaps for a free-text query.
+
+        Exact term matches rank first, then prefix matches on any word, then
+        substring and trigram-similarity matches, which tolerate typos such
+        as "kubernets". Ties keep catalog order.
+
+        Args:
+            query (str): What the user typed
+            limit (int | None): Maximum number of results
+
+        Returns:
+            list[RoadmapEntry]: Matching roadmaps, best first
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        key = (query, limit)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return list(cached)
+
+        results = self._search(query, limit)
+        with self._lock:
+            self._results[key] = results
+            while len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return list(results)
+
+    def _search(self, query, limit):
+        scores = {}
+
+        def offer(index, score):
+            if score > scores.get(index, 0.0):
+                scores[index] = score
+
+        for index in self._exact.get(query, ()):
+            offer(index, EXACT_SCORE)
+        for index, term_length in self._prefix_matches(query).items():
+            offer(index, PREFIX_SCORE + 0.15 * len(query) / term_length)
+        if limit is not None and len(scores) >= limit:
+            # Enough exact/prefix hits; fuzzy matches could not outrank them.
+            return self._ranked(scores, limit)
+
+        grams = _trigrams(query)
+        query_size = sum(grams.values())
+        overlap = Counter()
+        for gram, count in grams.items():
+            for term_id, term_count in self._postings.get(gram, ()):
+                overlap[term_id] += min(count, term_count)
+        for term_id, shared in overlap.items():
+            index, term, term_size = self._terms[term_id]
+            if query in term:
+                offer(index, SUBSTRING_SCORE + 0.1 * len(query) / len(term))
+            similarity = 2 * shared / (query_size + term_size)
+            if similarity >= MIN_FUZZY_SIMILARITY:
+                offer(index, FUZZY_SCORE * similarity)
+            elif similarity >= MIN_TYPO_SIMILARITY and _within_one_edit(query, term):
+                offer(index, FUZZY_SCORE * MIN_FUZZY_SIMILARITY)
+
+        return self._ranked(scores, limit)
+
+    def _ranked(self, scores, limit):
+        ranked = sorted(scores, key=lambda index: (-scores[index], self.entries[index].order))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self.entries[index] for index in ranked]
@@ -5,6 +5,8 @@ Handles sidebar UI and navigation
 
 import streamlit as st
 
+from cancellation import cancel_active_generation
+
 
 def create_sidebar():
     """
@@ -60,6 +62,9 @@ def create_sidebar():
             "\U0001F5FA\ufe0f My Career Planner",
         ],
         key="sidebar_nav",
+        # Navigating away aborts any answer still streaming for this session.
+        on_change=cancel_active_generation,
+        args=(st.session_state,),
     )
 
     if page == "\U0001F3E0 Home":
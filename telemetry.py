@@ -0,0 +1,387 @@
+"""
+Telemetry module for Career Guidance Chatbot
+Per-call latency instrumentation for Gemini and per-rerun Streamlit costs, with Prometheus text output
+"""
+
+import json
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import (
+    TELEMETRY_RING_SIZE,
+    TELEMETRY_JSONL_PATH,
+    METRICS_PORT,
+    METRICS_HOST,
+    RERUN_METRICS_ENABLED,
+)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class CallRecord:
+    """Timing and size measurements for one Gemini call."""
+
+    __slots__ = (
+        "feature",
+        "model",
+        "started_at",
+        "_start",
+        "_dispatched",
+        "_first_chunk",
+        "queue_ms",
+        "ttft_ms",
+        "total_ms",
+        "chunks",
+        "output_chars",
+        "prompt_tokens",
+        "output_tokens",
+        "outcome",
+        "extra",
+    )
+
+    def __init__(self, feature, model):
+        self.feature = feature
+        self.model = model
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._dispatched = None
+        self._first_chunk = None
+        self.queue_ms = 0.0
+        self.ttft_ms = None
+        self.total_ms = None
+        self.chunks = 0
+        self.output_chars = 0
+        self.prompt_tokens = None
+        self.output_tokens = None
+        self.outcome = "ok"
+        self.extra = {}
+
+    def mark_dispatched(self):
+        """Record the moment the request left the local queue."""
+        self._dispatched = time.perf_counter()
+        self.queue_ms = (self._dispatched - self._start) * 1000
+
+    def observe(self, chunk):
+        """Account for one streamed SDK response chunk."""
+        if self._first_chunk is None:
+            self._first_chunk = time.perf_counter()
+            self.ttft_ms = (self._first_chunk - self._start) * 1000
+        self.chunks += 1
+        text = getattr(chunk, "text", None)
+        if text:
+            self.output_chars += len(text)
+        usage = getattr(chunk, "usage_metadata", None)
+        if usage is not None:
+            self.prompt_tokens = getattr(usage, "prompt_token_count", None) or self.prompt_tokens
+            self.output_tokens = (
+                getattr(usage, "candidates_token_count", None) or self.output_tokens
+            )
+
+    def finish(self, outcome):
+        self.total_ms = (time.perf_counter() - self._start) * 1000
+        self.outcome = outcome
+        if self.output_tokens is None and self.output_chars:
+            # Fall back to the local ~4 characters per token estimate.
+            self.output_tokens = (self.output_chars + 3) // 4
+
+    def chunk_rate(self):
+        """Chunks per second after the first chunk arrived."""
+        if self._first_chunk is None or self.chunks < 2 or self.total_ms is None:
+            return None
+        streaming_ms = self.total_ms - self.ttft_ms
+        return round((self.chunks - 1) / (streaming_ms / 1000), 2) if streaming_ms > 0 else None
+
+    def to_dict(self):
+        data = {
+            "feature": self.feature,
+            "model": self.model,
+            "started_at": round(self.started_at, 3),
+            "queue_ms": round(self.queue_ms, 1),
+            "ttft_ms": round(self.ttft_ms, 1) if self.ttft_ms is not None else None,
+            "total_ms": round(self.total_ms, 1) if self.total_ms is not None else None,
+            "chunks": self.chunks,
+            "chunks_per_second": self.chunk_rate(),
+            "output_chars": self.output_chars,
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "outcome": self.outcome,
+        }
+        data.update(self.extra)
+        return data
+
+
+class JsonlSink:
+    """Append each record as one JSON line."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+
+def _quantile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class RingBufferSink:
+    """Keep the most recent records in memory plus cumulative per-feature counters."""
+
+    def __init__(self, size):
+        self._records = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._calls = Counter()
+        self._output_tokens = Counter()
+
+    def emit(self, record):
+        with self._lock:
+            self._records.append(record)
+            self._calls[(record["feature"], record["outcome"])] += 1
+            self._output_tokens[record["feature"]] += record.get("output_tokens") or 0
+
+    def records(self, feature=None):
+        with self._lock:
+            return [r for r in self._records if feature is None or r["feature"] == feature]
+
+    def summary(self, feature=None):
+        """
+        Latency percentiles over the buffered window.
+
+        Returns:
+            dict: count plus p50/p95/p99 of TTFT and total duration in ms
+        """
+        records = [r for r in self.records(feature) if r["outcome"] == "ok"]
+        ttft = sorted(r["ttft_ms"] for r in records if r["ttft_ms"] is not None)
+        total = sorted(r["total_ms"] for r in records if r["total_ms"] is not None)
+        result = {"count": len(records)}
+        for q in QUANTILES:
+            label = f"p{int(q * 100)}"
+            result[f"ttft_{label}_ms"] = _quantile(ttft, q)
+            result[f"total_{label}_ms"] = _quantile(total, q)
+        return result
+
+    def render_prometheus(self):
+        """Render metrics in the Prometheus text exposition format."""
+        records = self.records()
+        features = sorted({r["feature"] for r in records})
+        lines = []
+
+        for metric, field in (
+            ("gemini_call_duration_seconds", "total_ms"),
+            ("gemini_time_to_first_chunk_seconds", "ttft_ms"),
+        ):
+            lines.append(f"# TYPE {metric} summary")
+            for feature in features:
+                values = sorted(
+                    r[field] / 1000
+                    for r in records
+                    if r["feature"] == feature and r["outcome"] == "ok" and r[field] is not None
+                )
+                for q in QUANTILES:
+                    value = _quantile(values, q)
+                    if value is not None:
+                        lines.append(f'{metric}{{feature="{feature}",quantile="{q}"}} {value:.4f}')
+                lines.append(f'{metric}_count{{feature="{feature}"}} {len(values)}')
+                lines.append(f'{metric}_sum{{feature="{feature}"}} {sum(values):.4f}')
+
+        with self._lock:
+            calls = dict(self._calls)
+            tokens = dict(self._output_tokens)
+        lines.append("# TYPE gemini_calls_total counter")
+        for (feature, outcome), count in sorted(calls.items()):
+            lines.append(f'gemini_calls_total{{feature="{feature}",outcome="{outcome}"}} {count}')
+        lines.append("# TYPE gemini_output_tokens_total counter")
+        for feature, count in sorted(tokens.items()):
+            lines.append(f'gemini_output_tokens_total{{feature="{feature}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+ring_buffer = RingBufferSink(TELEMETRY_RING_SIZE)
+_sinks = [ring_buffer]
+if TELEMETRY_JSONL_PATH:
+    _sinks.append(JsonlSink(TELEMETRY_JSONL_PATH))
+
+
+def add_sink(sink):
+    """Register an extra sink; it must provide emit(record_dict)."""
+    _sinks.append(sink)
+
+
+def emit(record):
+    """Send a finished record to every sink."""
+    data = record.to_dict()
+    for sink in list(_sinks):
+        try:
+            sink.emit(data)
+        except Exception:
+            # Telemetry must never break a user request.
+            pass
+
+
+@contextmanager
+def track_call(feature, model, **extra):
+    """
+    Measure one Gemini call.
+
+    Keyword arguments are stored as extra fields on the record, e.g. the
+    routing decision, so latency can be broken down by them.
+
+    Call record.mark_dispatched() once a limiter slot is held and
+    record.observe(chunk) for every SDK chunk. The outcome is "cancelled" when
+    the consumer stops reading early and the exception name on failure.
+
+    Yields:
+        CallRecord: The record being filled in
+    """
+    record = CallRecord(feature, model)
+    record.extra.update(extra)
+    try:
+        yield record
+    except GeneratorExit:
+        record.finish("cancelled")
+        emit(record)
+        raise
+    except BaseException as exc:
+        record.finish(f"error:{type(exc).__name__}")
+        emit(record)
+        raise
+    record.finish("ok")
+    emit(record)
+
+
+def latency_summary(feature=None):
+    """Return p50/p95/p99 TTFT and duration for a feature (or all features)."""
+    return ring_buffer.summary(feature)
+
+
+_reruns = deque(maxlen=TELEMETRY_RING_SIZE)
+_reruns_lock = threading.Lock()
+_rerun_state = threading.local()
+
+
+@contextmanager
+def track_rerun():
+    """
+    Measure one Streamlit script run.
+
+    Records the script thread's CPU time, wall time, and the number and
+    serialized size of the element deltas it sends to the browser. Deltas at
+    least global.minCachedMessageSize bytes are counted separately, since
+    Streamlit can replace those with short hash references when the browser
+    already holds them. Outside a Streamlit script run, or nested inside an
+    outer track_rerun (a fragment during a full run), this is a no-op.
+    """
+    ctx = None
+    if RERUN_METRICS_ENABLED and not getattr(_rerun_state, "active", False):
+        from streamlit import config as st_config
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        yield None
+        return
+
+    min_cached = int(st_config.get_option("global.minCachedMessageSize"))
+    record = {"deltas": 0, "delta_bytes": 0, "cacheable_bytes": 0}
+    enqueue = ctx._enqueue
+
+    def measured_enqueue(msg):
+        size = msg.ByteSize()
+        record["deltas"] += 1
+        record["delta_bytes"] += size
+        if size >= min_cached:
+            record["cacheable_bytes"] += size
+        enqueue(msg)
+
+    ctx._enqueue = measured_enqueue
+    _rerun_state.active = True
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        # Reruns and st.stop() end the script with an exception; still record them.
+        _rerun_state.active = False
+        ctx._enqueue = enqueue
+        record["cpu_ms"] = round((time.thread_time() - cpu_start) * 1000, 3)
+        record["wall_ms"] = round((time.perf_counter() - wall_start) * 1000, 3)
+        with _reruns_lock:
+            _reruns.append(record)
+
+
+def rerun_summary():
+    """Return p50/p95 CPU time and delta bytes over the recorded reruns."""
+    with _reruns_lock:
+        records = list(_reruns)
+    result = {"count": len(records)}
+    for field in ("cpu_ms", "wall_ms", "delta_bytes", "cacheable_bytes"):
+        values = sorted(r[field] for r in records)
+        for q in QUANTILES[:2]:
+            result[f"{field}_p{int(q * 100)}"] = _quantile(values, q)
+    return result
+
+
+def render_rerun_prometheus():
+    """Render rerun metrics in the Prometheus text exposition format."""
+    with _reruns_lock:
+        records = list(_reruns)
+    lines = []
+    for metric, field, scale in (
+        ("streamlit_rerun_cpu_seconds", "cpu_ms", 1000),
+        ("streamlit_rerun_delta_bytes", "delta_bytes", 1),
+    ):
+        values = sorted(r[field] / scale for r in records)
+        lines.append(f"# TYPE {metric} summary")
+        for q in QUANTILES:
+            value = _quantile(values, q)
+            if value is not None:
+                lines.append(f'{metric}{{quantile="{q}"}} {value:.4f}')
+        lines.append(f"{metric}_count {len(values)}")
+        lines.append(f"{metric}_sum {sum(values):.4f}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = (ring_buffer.render_prometheus() + render_rerun_prometheus()).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+_metrics_server = None
+_metrics_lock = threading.Lock()
+
+
+def ensure_metrics_server(port=METRICS_PORT, host=METRICS_HOST):
+    """Serve /metrics on host:port from a background thread, once per process."""
+    global _metrics_server
+    if port is None:
+        return None
+    with _metrics_lock:
+        if _metrics_server is None:
+            _metrics_server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            _metrics_server.daemon_threads = True
+            threading.Thread(
+                target=_metrics_server.serve_forever, name="metrics", daemon=True
+            ).start()
+        return _metrics_server
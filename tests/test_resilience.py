@@ -0,0 +1,120 @@
+"""
+Tests for the circuit breaker in resilience.py
+"""
+
+import asyncio
+import time
+
+import pytest
+import requests
+from google.genai import errors
+
+import resilience
+from resilience import CircuitBreaker, CircuitOpenError, aresilient_stream, resilient_stream
+
+COOLDOWN_SECONDS = 0.05
+
+
+def _api_error(code):
+    response = requests.Response()
+    response.status_code = code
+    response._content = f'{{"error": {{"code": {code}, "message": "test"}}}}'.encode()
+    return errors.APIError(code, response)
+
+
+def _failing(exc):
+    def producer():
+        raise exc
+        yield  # pragma: no cover
+
+    return producer
+
+
+def _healthy():
+    return iter(["ok"])
+
+
+async def _afailing_stream(exc):
+    raise exc
+    yield  # pragma: no cover
+
+
+async def _ahealthy_stream():
+    yield "ok"
+
+
+@pytest.fixture(autouse=True)
+def single_attempt(monkeypatch):
+    monkeypatch.setattr(resilience, "GEMINI_RETRY_ATTEMPTS", 1)
+
+
+def _tripped_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=COOLDOWN_SECONDS)
+    for _ in range(2):
+        with pytest.raises(errors.APIError):
+            list(resilient_stream(_failing(_api_error(503)), breaker=breaker, hedge_after=None))
+    assert breaker.state() == "open"
+    time.sleep(COOLDOWN_SECONDS * 2)
+    return breaker
+
+
+@pytest.mark.parametrize("exc", [_api_error(400), resilience.LimiterTimeout("queue")])
+def test_non_transient_probe_failure_frees_the_probe(exc):
+    breaker = _tripped_breaker()
+    with pytest.raises(type(exc)):
+        list(resilient_stream(_failing(exc), breaker=breaker, hedge_after=None))
+
+    assert list(resilient_stream(_healthy, breaker=breaker, hedge_after=None)) == ["ok"]
+    assert breaker.state() == "closed"
+
+
+def test_non_transient_probe_failure_keeps_failure_count():
+    breaker = _tripped_breaker()
+    with pytest.raises(errors.APIError):
+        list(resilient_stream(_failing(_api_error(400)), breaker=breaker, hedge_after=None))
+    assert breaker.stats()["consecutive_failures"] == 2
+
+
+def test_transient_probe_failure_reopens_circuit():
+    breaker = _tripped_breaker()
+    with pytest.raises(errors.APIError):
+        list(resilient_stream(_failing(_api_error(503)), breaker=breaker, hedge_after=None))
+    with pytest.raises(CircuitOpenError):
+        list(resilient_stream(_healthy, breaker=breaker, hedge_after=None))
+
+
+def test_async_probe_failure_frees_the_probe():
+    breaker = _tripped_breaker()
+
+    async def scenario():
+        with pytest.raises(errors.APIError):
+            async for _ in aresilient_stream(
+                lambda: _afailing_stream(_api_error(400)), breaker=breaker, hedge_after=None
+            ):
+                pass
+        return [chunk async for chunk in aresilient_stream(_ahealthy_stream, breaker=breaker, hedge_after=None)]
+
+    assert asyncio.run(scenario()) == ["ok"]
+    assert breaker.state() == "closed"
+
+
+def test_async_probe_cancelled_while_opening_frees_the_probe():
+    breaker = _tripped_breaker()
+
+    async def scenario():
+        async def slow_stream():
+            await asyncio.sleep(10)
+            yield "late"
+
+        async def consume():
+            async for _ in aresilient_stream(slow_stream, breaker=breaker, hedge_after=None):
+                pass
+
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return [chunk async for chunk in aresilient_stream(_ahealthy_stream, breaker=breaker, hedge_after=None)]
+
+    assert asyncio.run(scenario()) == ["ok"]
@@ -0,0 +1,141 @@
+"""
+Topic guard module for Career Guidance Chatbot
+Local naive Bayes classifier that answers clearly off-topic questions without calling Gemini
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+
+from config import TOPIC_GUARD_ENABLED, TOPIC_GUARD_THRESHOLD, TOPIC_GUARD_MIN_KNOWN_FEATURES
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+TRAIN_PATH = os.path.join(DATA_DIR, "topic_guard_train.jsonl")
+EVAL_PATH = os.path.join(DATA_DIR, "topic_guard_eval.jsonl")
+
+CAREER = "career"
+OFF_TOPIC = "off_topic"
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = frozenset(
+    "a an the is are am i me my you your to of for in on at do does how what which who "
+    "can should will would be it this that and or with about tell give".split()
+)
+
+
+def _features(text):
+    """Lowercased unigrams (without stopwords) plus adjacent-word bigrams."""
+    words = _TOKEN.findall((text or "").lower())
+    unigrams = [w for w in words if w not in _STOPWORDS]
+    bigrams = [f"{a} {b}" for a, b in zip(words, words[1:])]
+    return unigrams + bigrams
+
+
+def load_examples(path):
+    """Read (text, label) pairs from a JSONL file."""
+    examples = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                item = json.loads(line)
+                examples.append((item["text"], item["label"]))
+    return examples
+
+
+class TopicClassifier:
+    """Multinomial naive Bayes over unigram and bigram features with Laplace smoothing."""
+
+    def __init__(self, examples):
+        counts = {CAREER: Counter(), OFF_TOPIC: Counter()}
+        docs = Counter()
+        for text, label in examples:
+            counts[label].update(_features(text))
+            docs[label] += 1
+
+        vocab = set(counts[CAREER]) | set(counts[OFF_TOPIC])
+        self.vocab = frozenset(vocab)
+        total_docs = sum(docs.values())
+        self.log_prior = {label: math.log(docs[label] / total_docs) for label in counts}
+        self.log_likelihood = {}
+        self.log_unseen = {}
+        for label, counter in counts.items():
+            denom = sum(counter.values()) + len(vocab)
+            self.log_likelihood[label] = {
+                feature: math.log((count + 1) / denom) for feature, count in counter.items()
+            }
+            self.log_unseen[label] = math.log(1 / denom)
+
+    def off_topic_probability(self, text):
+        """
+        Return P(off_topic | text) and the number of in-vocabulary features.
+
+        Returns:
+            tuple[float, int]: Posterior probability and known feature count
+        """
+        scores = dict(self.log_prior)
+        known = 0
+        for feature in _features(text):
+            if feature not in self.vocab:
+                continue
+            known += 1
+            for label in scores:
+                scores[label] += self.log_likelihood[label].get(feature, self.log_unseen[label])
+
+        diff = scores[CAREER] - scores[OFF_TOPIC]
+        if diff > 700:
+            return 0.0, known
+        return 1.0 / (1.0 + math.exp(diff)), known
+
+    def is_off_topic(self, text, threshold=TOPIC_GUARD_THRESHOLD):
+        """True only when the prompt is confidently off-topic; ambiguous prompts return False."""
+        probability, known = self.off_topic_probability(text)
+        return known >= TOPIC_GUARD_MIN_KNOWN_FEATURES and probability >= threshold
+
+
+def evaluate(classifier, examples, threshold=TOPIC_GUARD_THRESHOLD):
+    """
+    Measure how well the guard short-circuits off-topic prompts.
+
+    Precision is the share of short-circuited prompts that really were
+    off-topic; a false positive means a student's career question got refused.
+
+    Returns:
+        dict: precision, recall, short-circuit count and false positives
+    """
+    true_positive = false_positive = false_negative = 0
+    for text, label in examples:
+        predicted = classifier.is_off_topic(text, threshold)
+        if predicted and label == OFF_TOPIC:
+            true_positive += 1
+        elif predicted:
+            false_positive += 1
+        elif label == OFF_TOPIC:
+            false_negative += 1
+
+    flagged = true_positive + false_positive
+    actual = true_positive + false_negative
+    return {
+        "threshold": threshold,
+        "precision": round(true_positive / flagged, 4) if flagged else 1.0,
+        "recall": round(true_positive / actual, 4) if actual else 0.0,
+        "short_circuited": flagged,
+        "false_positives": false_positive,
+    }
+
+
+_classifier = TopicClassifier(load_examples(TRAIN_PATH)) if TOPIC_GUARD_ENABLED else None
+
+
+def is_off_topic(text):
+    """Return True if the shared guard is enabled and confidently flags text as off-topic."""
+    return _classifier is not None and _classifier.is_off_topic(text)
+
+
+if __name__ == "__main__":
+    classifier = _classifier or TopicClassifier(load_examples(TRAIN_PATH))
+    eval_examples = load_examples(EVAL_PATH)
+    for value in (0.8, 0.9, 0.95, TOPIC_GUARD_THRESHOLD, 0.99):
+        print(evaluate(classifier, eval_examples, value))
@@ -3,8 +3,26 @@ UI module for Career Guidance Chatbot
 Handles all Streamlit UI components and layout
 """
 
+import re
+import secrets
+
 import streamlit as st
-from chatbot import initialize_gemini_client, generate_response
+from cancellation import (
+    GenerationCancelled,
+    begin_generation,
+    cancel_active_generation,
+    finish_generation,
+)
+from career_profile import RecommenderAnalysis, build_synthesis_prompt, rank_career_paths
+from chat_history import ChatHistory
+from chatbot import initialize_gemini_client, stream_response
+from context_window import new_context_state
+from fragments import fragment, rerun_fragment
+from conversation_store import conversation_id, conversation_store
+from render_cache import markdown_cache, prepare_markdown
+from resilience import is_quota_error, is_unavailable_error
+from roadmap_search import ROADMAP_ALIASES, RoadmapIndex
+from telemetry import ensure_metrics_server, track_rerun
 from config import (
     PAGE_TITLE,
     PAGE_LAYOUT,
@@ -12,6 +30,7 @@ from config import (
     APP_SUBTITLE,
     PAGE_ICON,
     ROADMAP_OPTIONS,
+    CHAT_PAGE_SIZE,
 )
 from styles import (
     apply_all_styles,
@@ -53,7 +72,8 @@ CAREER_RECOMMENDER_QUESTIONS = [
 CAREER_RECOMMENDER_SYSTEM_PROMPT = """
 You are a structured AI Career Recommender for engineering students in India.
 
-You will receive 5 collected answers from the student.
+You will receive 5 collected answers from the student, possibly followed by an
+optional hint listing paths a keyword match suggests; the answers take precedence.
 Your task:
 1. Analyze the answers carefully.
 2. Suggest 3-5 suitable career paths.
@@ -139,6 +159,10 @@ SKILL_BASED_ROADMAPS = {
     "WordPress": "wordpress",
 }
 
+# Built once per process; roadmaps listed in both catalogs appear once in results.
+ROADMAP_INDEX = RoadmapIndex([ROADMAP_SH_OPTIONS, SKILL_BASED_ROADMAPS], ROADMAP_ALIASES)
+ROADMAP_SEARCH_LIMIT = 12
+
 
 def setup_page_config():
     """Configure Streamlit page settings."""
@@ -158,26 +182,81 @@ def render_header():
     )
 
 
+CHAT_WELCOME_MESSAGE = (
+    "Welcome! I am here to help you grow, plan, and succeed. "
+    "Share your branch/year, your target role or exam, and your current skill level "
+    "and we will create a clear path forward together."
+)
+
+
+_CHAT_TOKEN = re.compile(r"[0-9a-f]{32}")
+
+
+def _chat_session_id():
+    """
+    Return this browser's conversation token, kept in the page URL as ?chat=.
+
+    The token is 128 random bits, so it cannot be guessed, and the URL
+    survives a reload; anyone holding the URL can read the conversation.
+    """
+    if "chat_session_id" not in st.session_state:
+        token = st.query_params.get("chat", "")
+        if not _CHAT_TOKEN.fullmatch(token):
+            token = secrets.token_hex(16)
+            st.query_params["chat"] = token
+        st.session_state.chat_session_id = token
+    return st.session_state.chat_session_id
+
+
+def _open_chat_history():
+    """Return this session's chat history, opening its stored conversation the first time."""
+    history = st.session_state.get("messages")
+    if history is not None:
+        return history
+    welcome = [{"role": "assistant", "content": CHAT_WELCOME_MESSAGE}]
+    if conversation_store is None:
+        return ChatHistory(welcome)
+    conversation = conversation_id(_chat_session_id(), "chat")
+    return ChatHistory(welcome, store=conversation_store, conversation=conversation)
+
+
 def initialize_chat_state():
     """Initialize session state for chat history."""
-    if "messages" not in st.session_state:
-        st.session_state.messages = [
-            {
-                "role": "assistant",
-                "content": (
-                    "Welcome! I am here to help you grow, plan, and succeed. "
-                    "Share your branch/year, your target role or exam, and your current skill level "
-                    "and we will create a clear path forward together."
-                ),
-            }
-        ]
+    history = _open_chat_history()
+    if st.session_state.get("messages") is not history:
+        st.session_state.messages = history
+        st.session_state.context_state = new_context_state()
+        st.session_state.chat_visible_messages = CHAT_PAGE_SIZE
+
+
+def _render_message_history(history, visible_key, assistant_html=False):
+    """
+    Render only the newest page of a ChatHistory, with a control to load older pages.
+
+    Args:
+        history (ChatHistory): Messages to render
+        visible_key (str): Session-state key holding how many messages are drawn
+        assistant_html (bool): Allow HTML in assistant messages
+    """
+    total = len(history)
+    visible = st.session_state.get(visible_key, CHAT_PAGE_SIZE)
+
+    if total > visible:
+        if st.button("Load older messages", key=f"{visible_key}_button"):
+            visible += CHAT_PAGE_SIZE
+    st.session_state[visible_key] = visible
+
+    for message in history[max(0, total - visible) :]:
+        with st.chat_message(message.role):
+            st.markdown(
+                markdown_cache.get(message.content),
+                unsafe_allow_html=assistant_html and message.role == "assistant",
+            )
 
 
 def render_chat_history():
-    """Render all chat messages."""
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
+    """Render the newest page of chat messages."""
+    _render_message_history(st.session_state.messages, "chat_visible_messages")
 
 
 def _format_recommender_question(index):
@@ -216,21 +295,72 @@ def _render_roadmap_buttons(roadmaps, key_prefix):
                     st.session_state.selected_roadmap_slug = roadmaps[roadmap_name]
 
 
+def _render_stream(chunks, unsafe_allow_html=False):
+    """Render streamed chunks progressively into one placeholder and return the full text."""
+    placeholder = st.empty()
+    full_response = ""
+
+    try:
+        for chunk in chunks:
+            full_response += chunk
+            placeholder.markdown(
+                prepare_markdown(full_response) + "▌", unsafe_allow_html=unsafe_allow_html
+            )
+    finally:
+        # Closing the stream early (rerun, cancellation) releases the shared upstream call.
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+    full_response = full_response.strip()
+    placeholder.markdown(markdown_cache.get(full_response), unsafe_allow_html=unsafe_allow_html)
+    return full_response
+
+
+def _show_unavailable_notice(exc):
+    """Explain a Gemini quota or availability problem instead of crashing the page."""
+    if is_quota_error(exc):
+        st.warning("Gemini quota is exhausted right now. Please try again in a minute.")
+    else:
+        st.warning("The AI service is temporarily unavailable. Please try again shortly.")
+
+
 def handle_chat_turn(prompt, client):
     """Handle one user turn and stream model response."""
-    history = st.session_state.messages.copy()
+    # A new prompt supersedes whatever this session was still generating.
+    token = begin_generation(st.session_state)
+    # The request snapshots the history when created, before this turn is appended,
+    # and only converts messages added since the previous turn.
+    stream = stream_response(
+        prompt,
+        client,
+        history=st.session_state.messages,
+        context_state=st.session_state.context_state,
+        cancel_token=token,
+    )
 
     st.session_state.messages.append({"role": "user", "content": prompt})
     with st.chat_message("user"):
         st.markdown(prompt)
 
+    answered = False
     with st.chat_message("assistant"):
-        placeholder = st.empty()
-        full_response = ""
-
-        reply = generate_response(prompt, client, history=history)
-        full_response += reply
-        placeholder.markdown(full_response)
+        try:
+            full_response = _render_stream(stream)
+            answered = True
+        except GenerationCancelled:
+            return
+        except Exception as exc:
+            if not is_unavailable_error(exc):
+                raise
+            _show_unavailable_notice(exc)
+            return
+        finally:
+            finish_generation(st.session_state, token)
+            if not answered:
+                # Roll back the unanswered prompt (also on a rerun that interrupts
+                # the stream) so it is neither kept nor stored without a reply.
+                st.session_state.messages.pop()
 
     st.session_state.messages.append({"role": "assistant", "content": full_response})
 
@@ -268,34 +398,51 @@ def render_roadmap_section():
 def initialize_recommender_state():
     """Initialize session state for structured career recommender flow."""
     if "rec_messages" not in st.session_state:
-        st.session_state.rec_messages = [
-            {
-                "role": "assistant",
-                "content": (
-                    "Hi! I am your structured AI Career Recommender. "
-                    "I will ask 5 short questions, one by one, before suggesting career paths.\n\n"
-                    f"{_format_recommender_question(0)}"
-                ),
-            }
-        ]
+        st.session_state.rec_messages = ChatHistory(
+            [
+                {
+                    "role": "assistant",
+                    "content": (
+                        "Hi! I am your structured AI Career Recommender. "
+                        "I will ask 5 short questions, one by one, before suggesting "
+                        f"career paths.\n\n{_format_recommender_question(0)}"
+                    ),
+                }
+            ]
+        )
         st.session_state.rec_question_index = 0
         st.session_state.rec_answers = []
         st.session_state.rec_complete = False
 
 
+def _recommender_analysis():
+    """Return the session's answer analysis, re-analysing answers if it is missing."""
+    analysis = st.session_state.get("rec_analysis")
+    if analysis is None:
+        analysis = RecommenderAnalysis()
+        for index, answer in enumerate(st.session_state.rec_answers):
+            analysis.submit(index, answer)
+        st.session_state.rec_analysis = analysis
+    return analysis
+
+
 def _build_recommender_input():
-    """Build model input from collected recommender answers."""
-    answers = st.session_state.rec_answers
-    return f"""
-Student responses:
-1. Subjects/activities enjoyed: {answers[0]}
-2. Current skills: {answers[1]}
-3. Preferred work type: {answers[2]}
-4. Team vs independent preference: {answers[3]}
-5. Long-term goals: {answers[4]}
+    """Build model input from the collected answers and the local shortlist."""
+    profile = _recommender_analysis().profile()
+    return build_synthesis_prompt(st.session_state.rec_answers, rank_career_paths(profile))
 
-Now provide personalized recommendations exactly as instructed.
-""".strip()
+
+def _render_analysis_progress():
+    """Show how many answers have been analysed and the leading paths."""
+    analysis = _recommender_analysis()
+    done = analysis.progress()
+    if not done:
+        return
+    total = len(CAREER_RECOMMENDER_QUESTIONS)
+    st.progress(done / total, text=f"Profile analysis: {done} of {total} answers processed")
+    leaders = rank_career_paths(analysis.profile(), limit=3)
+    if leaders:
+        st.caption("Leading matches so far: " + ", ".join(path["name"] for path in leaders))
 
 
 def render_career_recommender_page():
@@ -305,14 +452,20 @@ def render_career_recommender_page():
     st.header("Career Recommender")
     st.caption("Answer each question. After 5 answers, you will get personalized career paths.")
 
+    _render_recommender_conversation(client)
+
+
+@fragment
+def _render_recommender_conversation(client):
+    """Render the recommender questions, answers and result; reruns on its own."""
     initialize_recommender_state()
 
-    for message in st.session_state.rec_messages:
-        with st.chat_message(message["role"]):
-            if message["role"] == "assistant":
-                st.markdown(message["content"], unsafe_allow_html=True)
-            else:
-                st.markdown(message["content"])
+    _render_message_history(
+        st.session_state.rec_messages, "rec_visible_messages", assistant_html=True
+    )
+
+    if not st.session_state.rec_complete:
+        _render_analysis_progress()
 
     user_answer = st.chat_input("Type your answer...")
 
@@ -321,6 +474,7 @@ def render_career_recommender_page():
         st.session_state.rec_messages.append({"role": "user", "content": answer})
 
         if not st.session_state.rec_complete:
+            _recommender_analysis().submit(len(st.session_state.rec_answers), answer)
             st.session_state.rec_answers.append(answer)
             st.session_state.rec_question_index += 1
 
@@ -333,27 +487,62 @@ def render_career_recommender_page():
                     }
                 )
             else:
-                with st.spinner("Analyzing your responses and preparing recommendations..."):
-                    model_input = _build_recommender_input()
-                    recommendation = generate_response(
-                        model_input,
-                        client,
-                        history=None,
-                        system_prompt=CAREER_RECOMMENDER_SYSTEM_PROMPT,
-                    )
+                with st.chat_message("user"):
+                    st.markdown(answer)
+                with st.chat_message("assistant"):
+                    token = begin_generation(st.session_state)
+                    answered = False
+                    try:
+                        model_input = _build_recommender_input()
+                        recommendation = _render_stream(
+                            stream_response(
+                                model_input,
+                                client,
+                                history=None,
+                                system_prompt=CAREER_RECOMMENDER_SYSTEM_PROMPT,
+                                feature="recommender",
+                                cancel_token=token,
+                            ),
+                            unsafe_allow_html=True,
+                        )
+                        answered = True
+                    except GenerationCancelled:
+                        return
+                    except Exception as exc:
+                        if not is_unavailable_error(exc):
+                            raise
+                        _show_unavailable_notice(exc)
+                        return
+                    finally:
+                        finish_generation(st.session_state, token)
+                        if not answered:
+                            # Roll back the last answer (also on a rerun or navigation that
+                            # interrupts the stream) so the student can resubmit it.
+                            st.session_state.rec_messages.pop()
+                            st.session_state.rec_answers.pop()
+                            _recommender_analysis().discard(len(st.session_state.rec_answers))
+                            st.session_state.rec_question_index -= 1
 
                 st.session_state.rec_messages.append(
                     {"role": "assistant", "content": recommendation}
                 )
                 st.session_state.rec_complete = True
 
-        st.rerun()
+        rerun_fragment()
 
     if st.button("Restart Recommender"):
-        for key in ["rec_messages", "rec_question_index", "rec_answers", "rec_complete"]:
+        cancel_active_generation(st.session_state)
+        for key in [
+            "rec_messages",
+            "rec_question_index",
+            "rec_answers",
+            "rec_complete",
+            "rec_visible_messages",
+            "rec_analysis",
+        ]:
             if key in st.session_state:
                 del st.session_state[key]
-        st.rerun()
+        rerun_fragment()
 
 
 def render_roadmaps_page():
@@ -393,15 +582,13 @@ def render_roadmaps_page():
     )
 
     normalized_query = _normalize_text(query)
-    combined_roadmaps = {**ROADMAP_SH_OPTIONS, **SKILL_BASED_ROADMAPS}
-
-    filtered_roadmaps = {}
-    for name, slug in combined_roadmaps.items():
-        if normalized_query in _normalize_text(name) or normalized_query in slug:
-            filtered_roadmaps[name] = slug
+    filtered_roadmaps = {
+        entry.name: entry.slug
+        for entry in ROADMAP_INDEX.search(normalized_query, limit=ROADMAP_SEARCH_LIMIT)
+    }
 
     if normalized_query and not filtered_roadmaps:
-        st.info("No exact preset match found. Try another keyword from the available roadmap options.")
+        st.info("No matching roadmap found. Try another keyword from the available roadmap options.")
     else:
         if normalized_query:
             st.subheader("Search Results")
@@ -430,6 +617,12 @@ def render_roadmaps_page():
 
 def run_app():
     """Main application runner with navigation and sidebar."""
+    with track_rerun():
+        _render_app()
+
+
+def _render_app():
+    """Render the page chrome and the selected page for one script run."""
     if "current_page" not in st.session_state:
         st.session_state.current_page = "home"
     if "user_logged_in" not in st.session_state:
@@ -440,6 +633,9 @@ def run_app():
         st.session_state.quick_redirect_page = None
 
     setup_page_config()
+    ensure_metrics_server()
+    # Any rerun means the user acted again; stop a generation left over from the last run.
+    cancel_active_generation(st.session_state)
     apply_all_styles()
 
     # Use sidebar for navigation
@@ -488,11 +684,16 @@ def render_home_page():
     client = initialize_gemini_client()
 
     render_header()
+    _render_chat_area(client)
+    render_roadmap_section()
+
+
+@fragment
+def _render_chat_area(client):
+    """Render the chat history and input; a chat turn reruns only this fragment."""
     initialize_chat_state()
     render_chat_history()
 
     prompt = st.chat_input("Ask your career question...")
     if prompt and prompt.strip():
         handle_chat_turn(prompt.strip(), client)
-
-    render_roadmap_section()